@@ -1,13 +1,10 @@
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
 
-from matplotlib.patches import FancyBboxPatch
-import numpy as np
+import pandas as pd
 import streamlit as st
-
-from pages.Audits import compute_audit_commitment
-from pages.CAPAs import compute_capa_commitment
-from pages.Complaints import compute_complaint_commitment
-from pages.Training import compute_training_commitment
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 from utils import create_shifted_cmap, init_page, show_data_srcs
 from utils.constants import RAD_COLOR
@@ -25,8 +22,16 @@ COMMITMENT_WTS = OrderedDict([
     ('Complaints', 0.35),
     ('Training', 0.2),
 ])
+COMMITMENT_COLORS = [create_shifted_cmap('tab10', 4)(i) for i in range(len(COMMITMENT_WTS))]  # Weights pie chart wedge colors
+
+
+@st.cache_resource
+def get_commitment_executor() -> ThreadPoolExecutor:
+    """Returns the thread pool, shared across reruns, used to compute the individual commitments concurrently."""
+    return ThreadPoolExecutor(max_workers=len(COMMITMENT_WTS))
   
 
+@st.cache_data(ttl=3600)
 def compute_commitment(interval='Month'):
     """
     Computes the overall RA/QA commitment score for a given time interval.
@@ -47,27 +52,60 @@ def compute_commitment(interval='Month'):
             The category corresponding to that max min; 
             or an error message if the requsite source data could not be retrieved.
     """
-    commitments = {
-        'Audits': compute_audit_commitment(interval, False),
-        'CAPAs': compute_capa_commitment(interval, False), 
-        'Complaints': compute_complaint_commitment(interval, False), 
-        'Training': compute_training_commitment()[interval]
-    }
-    min_period = min_period_category = None
-    for category, commitment in commitments.items():
-        if commitment is not None and (min_period is None or commitment.index[0] > min_period):
-            min_period = commitment.index[0]
-            min_period_category = category
-    no_data_for = sorted(record_type for record_type, data in commitments.items() if data is None)
+    # Imported here rather than at module level, as importing a page reads its source data
+    from pages.Audits import compute_audit_commitment, df_audits
+    from pages.CAPAs import compute_capa_commitment, df_capas
+    from pages.Complaints import compute_complaint_commitment, df_complaints
+    from pages.Training import compute_training_commitment, df_training_mo
+
+    # Each page reads its source data on import, as an error message if it could not be retrieved. Check them all
+    # before computing anything, so that the message names every such source
+    src_data = {'Audits': df_audits, 'CAPAs': df_capas, 'Complaints': df_complaints, 'Training': df_training_mo}
+    no_data_for = sorted(record_type for record_type, data in src_data.items() if isinstance(data, str))
     if no_data_for:
         return 'Cannot compute commitment because ' + items_in_a_series(no_data_for) + ' data could not be retrieved.'
-    commitment = 1
-    for cat, wt in COMMITMENT_WTS.items():
-        commitment += commitments[cat] * wt
+
+    ctx = get_script_run_ctx()
+
+    def run_in_ctx(func, *args):
+        """Runs `func` in a worker thread with access to the current script run's context (e.g., for caching)."""
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return func(*args)
+
+    def compute_training_commitment_for_interval():
+        training_commitment = compute_training_commitment()
+        return None if training_commitment is None else training_commitment[interval]
+
+    # The four computations are independent, so run them concurrently
+    executor = get_commitment_executor()
+    futures = {
+        executor.submit(run_in_ctx, compute_audit_commitment, interval, False): 'Audits',
+        executor.submit(run_in_ctx, compute_capa_commitment, interval, False): 'CAPAs',
+        executor.submit(run_in_ctx, compute_complaint_commitment, interval, False): 'Complaints',
+        executor.submit(run_in_ctx, compute_training_commitment_for_interval): 'Training'
+    }
+
+    commitments = {category: future.result() for future, category in futures.items()}
+    no_commitment_for = sorted(category for category, commitment in commitments.items() if commitment is None)
+    if no_commitment_for:
+        return 'Cannot compute commitment because ' + items_in_a_series(no_commitment_for) + ' commitment could not be computed.'
+
+    # First period of each commitment, in COMMITMENT_WTS order so that ties go to the first category
+    first_periods = {category: commitments[category].index[0] for category in COMMITMENT_WTS}
+    min_period_category = max(first_periods, key=first_periods.get)
+    min_period = first_periods[min_period_category]
+    # Weighted sum of the aligned commitments in a single pass. The outer join is sorted so that the periods are in
+    # chronological order, as they are when aligning with `+`
+    commitment = 1 + pd.concat(
+        [commitments[cat] for cat in COMMITMENT_WTS], axis=1, keys=list(COMMITMENT_WTS), sort=True
+    ).dot(pd.Series(COMMITMENT_WTS))
     return commitment, min_period, min_period_category
 
 
 if __name__ == '__main__':
+    from matplotlib.patches import FancyBboxPatch
+    import numpy as np
+
     st.title('RA/QA KPIs')
     st.markdown('**Note**: This page uses dummy training data! REAL QMS training stats will be provided once we roll out QMS training in Matrix!')
     render_toggle(release_dates=False)
@@ -105,7 +143,6 @@ if __name__ == '__main__':
             inset_ax = fig.add_axes([0.1, 0.575, 0.25, 0.25], zorder=3)
             inset_ax.set_title('Weights', fontsize=9, pad=0)
             inset_ax.patch.set_alpha(0.0)
-            cmap = create_shifted_cmap('tab10', 4)
             inset_ax.set_xticks([])
             inset_ax.set_yticks([])
             vals = list(COMMITMENT_WTS.values())
@@ -113,16 +150,16 @@ if __name__ == '__main__':
             wedges, texts = inset_ax.pie(
                 vals,
                 labels=None,
-                colors=[cmap(x) for x in range(len(COMMITMENT_WTS))],
+                colors=COMMITMENT_COLORS,
                 autopct=None,
                 wedgeprops={'edgecolor': 'white', 'alpha': 0.6},
             )
             for t in texts:
                 t.set_visible(False)
-            for i, wedge in enumerate(wedges):
-                ang = (wedge.theta2 + wedge.theta1) / 2.0  # angle in degrees
-                x = 0.6 * np.cos(np.deg2rad(ang))  # radius scaling -> closer to center
-                y = 0.6 * np.sin(np.deg2rad(ang))
+            angs = np.deg2rad([(wedge.theta2 + wedge.theta1) / 2.0 for wedge in wedges])  # wedge midpoint angles
+            xs = 0.6 * np.cos(angs)  # radius scaling -> closer to center
+            ys = 0.6 * np.sin(angs)
+            for i, (x, y) in enumerate(zip(xs, ys)):
                 inset_ax.text(
                     x, y,
                     f'{labels[i]}\n{vals[i]:.0%}',
@@ -9,7 +9,7 @@ from utils import compute_cts, init_page, show_data_srcs
 from utils.filters import render_breakdown_fixed, render_interval_filter, render_period_filter, render_toggle
 from utils.plotting import plot_bar, responsive_columns
 from utils.settings import get_settings
-from utils.text_fmt import period_str
+from utils.text_fmt import period_range_str
 
 
 if __name__ == '__main__':
@@ -51,7 +51,7 @@ def plot_ae_cts(ae_cts: dict, rad: bool = False) -> Optional[Tuple[matplotlib.fi
         'no_data_msg': ''
     }
 
-    period_string = 'during ' + period_str(start, interval) if start == end else 'between ' + period_str(start, interval) + ' and ' + period_str(end, interval)
+    period_string = period_range_str(start, end, interval)
     if rad:
         kwargs.update({
             'title': 'Rad Adverse Events',
@@ -89,9 +89,10 @@ if __name__ == '__main__':
         start, end = render_period_filter(PAGE_NAME)
         filtered_df_aes = render_breakdown_fixed(PAGE_NAME, df_aes)
        
-        all_ae_cts = compute_cts(PAGE_NAME, filtered_df_aes)
-        rad_ae_cts = compute_cts(PAGE_NAME, filtered_df_aes[filtered_df_aes['Manufacturer'] == 'RADFORMATION'])
-        non_rad_ae_cts = compute_cts(PAGE_NAME, filtered_df_aes[filtered_df_aes['Manufacturer'] != 'RADFORMATION'])
+        # Only received dates are plotted, so don't count by date of event
+        is_rad = filtered_df_aes['Manufacturer'] == 'RADFORMATION'
+        rad_ae_cts = compute_cts(PAGE_NAME, filtered_df_aes[is_rad], ['Date Received'])
+        non_rad_ae_cts = compute_cts(PAGE_NAME, filtered_df_aes[~is_rad], ['Date Received'])
         
         to_display = [
             plot_ae_cts(rad_ae_cts, rad=True)[0],
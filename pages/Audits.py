@@ -1,15 +1,17 @@
 import os
-from typing import Optional
+from typing import Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 from read_data.read_audits import read_audit_data
-from utils import compute_cts, create_shifted_cmap, init_page, show_data_srcs
+from utils import compute_cts, init_page, show_data_srcs
+from utils.constants import BREAKDOWN_COLS
 from utils.plotting import plot_bar, responsive_columns
 from utils.filters import render_breakdown_fixed, render_interval_filter, render_period_filter, render_toggle
 from utils.settings import get_settings
-from utils.text_fmt import period_str
+from utils.text_fmt import period_range_str, period_str
 
 
 if __name__ == '__main__':
@@ -46,18 +48,68 @@ def compute_audit_commitment(
         return None
 
     df_audits_ = df_audits if not filter_by_type else filtered_df_audits
-    df_audits_ = df_audits_.copy()
 
+    # Only pass the period columns, so the cache key hashes two columns instead of the whole frame
+    return compute_audit_commitment_from_df(df_audits_[['Planned Start ' + interval, 'Start ' + interval]], interval)
+
+
+@st.cache_data
+def compute_audit_commitment_from_df(df_audits_: pd.DataFrame, interval: str = 'Month') -> pd.Series:
+    """
+    Computes the percentage of the given audits that were started in the same period as planned.
+
+    Cached on the contents of `df_audits_`, so reruns that don't change the audit type
+    filters or the interval reuse the previous result.
+
+    Parameters
+    ----------
+    df_audits_ (pd.DataFrame): Audits to compute commitment for. Must contain the `Planned Start <interval>`
+        and `Start <interval>` columns.
+    interval (Optional[str]): Time interval to compute commitment ('Month', 'Quarter', 'Year').
+        Defaults to 'Month'.
+
+    Returns
+    -------
+    pd.Series
+        Series indexed by period (`Planned Start <interval>`), containing the
+        commitment percentage.
+    """
     planned_col = 'Planned Start ' + interval
     start_col = 'Start ' + interval
 
-    df_audits_['match'] = df_audits_[planned_col] == df_audits_[start_col]
-    commitment = df_audits_.groupby(planned_col)['match'].mean() * 100
+    # Count matches per planned period with bincount instead of a groupby mean on a copied frame
+    planned = pd.Categorical(df_audits_[planned_col])
+    match = (df_audits_[planned_col] == df_audits_[start_col]).to_numpy()
+    has_planned = planned.codes >= 0  # Audits with no planned start have code -1
+    codes = planned.codes[has_planned]
+    n_matched = np.bincount(codes, weights=match[has_planned], minlength=len(planned.categories))
+    n_planned = np.bincount(codes, minlength=len(planned.categories))
+
+    commitment = pd.Series(n_matched / n_planned * 100, index=pd.Index(planned.categories, name=planned_col))
 
     return commitment
 
 
-df_audits, df_findings = read_audit_data()
+def get_audit_data() -> Tuple[Union[pd.DataFrame, str], Optional[pd.DataFrame]]:
+    """
+    Returns the audit and finding DataFrames, shared across reruns and sessions.
+
+    `read_audit_data` is cached as a resource, so these are the same objects on every
+    rerun. Callers must not mutate them.
+
+    Returns:
+        Tuple[Union[pd.DataFrame, str], Optional[pd.DataFrame]]: The audit and finding DataFrames,
+                                                                 or an error message string and
+                                                                 None if the audit data could not
+                                                                 be read from Matrix.
+    """
+    audit_data = read_audit_data()
+    if isinstance(audit_data, str):
+        return audit_data, None
+    return audit_data
+
+
+df_audits, df_findings = get_audit_data()
 
 
 if __name__ == '__main__':
@@ -73,11 +125,14 @@ if __name__ == '__main__':
         min_period = df_audits['Start ' + interval].min()
         min_period_str = period_str(min_period, interval)
         start, end = render_period_filter(PAGE_NAME, min_period)
-        filtered_df_audits = render_breakdown_fixed(PAGE_NAME, df_audits)
+        # Filter only the columns the plots use (the interval's planned start and start periods, plus the
+        # filterable columns), not every Matrix field
+        plotted_cols = ['Planned Start ' + interval, 'Start ' + interval] + BREAKDOWN_COLS[PAGE_NAME]
+        filtered_df_audits = render_breakdown_fixed(PAGE_NAME, df_audits[plotted_cols])
         
-        audit_cts = compute_cts(PAGE_NAME, filtered_df_audits)
+        audit_cts = compute_cts(PAGE_NAME, filtered_df_audits, ['Start Date'])  # Only completed audits are plotted
 
-        period_string = period_str(start, interval) if start == end else 'between ' + period_str(start, interval) + ' and ' + period_str(end, interval)
+        period_string = period_range_str(start, end, interval, preposition=None)
         to_display = []
         plot = plot_bar(
             PAGE_NAME,
@@ -89,7 +144,7 @@ if __name__ == '__main__':
             y_label='# Audits',
             y_integer=True,
             missing_as_zero=True,
-            no_data_msg='No audits matching your filters were completed ' + period_string + '.'
+            no_data_msg=f'No audits matching your filters were completed {period_string}.'
         )
         to_display.append(plot[0])
         plot = plot_bar(
@@ -103,7 +158,7 @@ if __name__ == '__main__':
             title='Audit Commitment',
             y_label='% planned audits completed',
             label_missing='No planned audits',
-            no_data_msg='No audits matching your filters were planned for ' + period_string + ', so cannot plot audit commitment.'
+            no_data_msg=f'No audits matching your filters were planned for {period_string}, so cannot plot audit commitment.'
         )
         to_display.append(plot[0])
         responsive_columns(to_display)
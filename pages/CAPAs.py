@@ -8,17 +8,121 @@ import pandas as pd
 import streamlit as st
 
 from read_data.read_capas import read_capa_data
-from utils import compute_bin_width, compute_cts, init_page, show_data_srcs
+from utils import compute_cts, compute_pct, init_page, show_data_srcs
 from utils.constants import ALL_PERIODS, DATE_COLS
 from utils.filters import render_breakdown_fixed, render_interval_filter, render_period_filter, render_toggle
 from utils.plotting import display_no_data_msg, plot_bar, responsive_columns
-from utils.text_fmt import period_str
+from utils.text_fmt import period_range_str
 
 
 if __name__ == '__main__':
     init_page('CAPAs')
 PAGE_NAME = os.path.splitext(os.path.basename(__file__))[0]
 
+# Boolean CAPA columns counted per submission period by compute_submission_stats
+FLAG_COLS = ['Submitted On Time', 'Passed Effectiveness Verification', 'Submitted Within 90d']
+
+# Columns read by compute_submission_stats for monthly stats, from which the quarterly and yearly stats are rolled up
+SUBMISSION_STATS_COLS = ['Month of Submission', 'Age'] + FLAG_COLS
+
+
+@st.cache_data
+def compute_submission_stats(closed_capas: pd.DataFrame, interval: str = 'Month') -> pd.DataFrame:
+    """
+    Computes per-submission-period counts for the given closed CAPAs, from which all the submission KPIs are derived.
+
+    All counts are bincounts over the codes of the categorical submission period column, whose categories
+    are ALL_PERIODS[interval], so no reindexing is needed. The flag counts all come from one bincount.
+    Cached on the contents of `closed_capas`.
+
+    Parameters
+    ----------
+    closed_capas (pd.DataFrame): Closed CAPAs to count.
+    interval (str): Time interval to group by ('Month', 'Quarter', 'Year'). Defaults to 'Month'.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame indexed by period (all periods in ALL_PERIODS, with zeros for periods without submissions), with
+        columns:
+        - '# Submitted': Number of CAPAs submitted.
+        - '# Submitted On Time': Number submitted on or before their due date.
+        - '# Passed Effectiveness Verification': Number that passed the effectiveness verification check.
+        - '# Submitted Within 90d': Number submitted within 90 days of being opened.
+        - 'Total Age': Sum of the days the CAPAs were open.
+        - '# With Age': Number of CAPAs with a known age (the denominator for average age).
+    """
+    periods = closed_capas[interval + ' of Submission'].cat
+    codes = periods.codes.to_numpy().astype(np.intp)
+    has_period = codes >= 0  # CAPAs with no submission period have code -1
+    codes = codes[has_period]
+
+    n_periods = len(periods.categories)
+
+    age = closed_capas['Age'].to_numpy(dtype=float)
+    has_age = ~np.isnan(age)
+
+    # Pack each CAPA's flags into the bits of one small int, so that a single bincount over (period, flags) pairs
+    # counts every flag at once
+    flags = [closed_capas[col].to_numpy(dtype=bool) for col in FLAG_COLS] + [has_age]
+    n_patterns = 1 << len(flags)
+    packed = np.zeros(len(closed_capas), dtype=np.intp)
+    for bit, flag in enumerate(flags):
+        packed |= flag.astype(np.intp) << bit
+    pattern_cts = np.bincount(
+        codes * n_patterns + packed[has_period], minlength=n_periods * n_patterns
+    ).reshape(n_periods, n_patterns)
+    flag_cts = pattern_cts @ ((np.arange(n_patterns)[:, np.newaxis] >> np.arange(len(flags))) & 1)
+
+    stats = pd.DataFrame(
+        {
+            '# Submitted': pattern_cts.sum(axis=1),
+            **{'# ' + col: flag_cts[:, i] for i, col in enumerate(FLAG_COLS)},
+            'Total Age': np.bincount(codes, weights=np.where(has_age, age, 0)[has_period], minlength=n_periods),
+            '# With Age': flag_cts[:, -1]
+        },
+        index=periods.categories
+    )
+
+    return stats
+
+
+def get_submission_stats(interval: str = 'Month', filter_by_selection: bool = True) -> pd.DataFrame:
+    """
+    Returns `compute_submission_stats` for the closed CAPAs. Only the columns it reads are passed, so its cache key
+    doesn't hash the rest of the CAPA fields (including list columns, which can only be hashed by pickling).
+
+    The stats are always computed by month, and quarterly and yearly stats are sums of the monthly stats. So
+    switching intervals reuses the cached monthly stats instead of counting the CAPAs again.
+
+    Parameters
+    ----------
+    interval (str): Time interval to group by ('Month', 'Quarter', 'Year'). Defaults to 'Month'.
+    filter_by_selection (bool): If True, only consider CAPAs of the user-selected filters. Defaults to True.
+
+    Returns
+    -------
+    pd.DataFrame
+        Per-period counts, as returned by `compute_submission_stats`.
+    """
+    closed_capas_ = filtered_closed_capas if filter_by_selection else closed_capas
+    stats = compute_submission_stats(closed_capas_[SUBMISSION_STATS_COLS])
+    if interval == 'Month':
+        return stats
+
+    # Sum each month's stats into its quarter/year, by the position of the quarter/year in ALL_PERIODS (every month in
+    # ALL_PERIODS['Month'] lies in one)
+    periods = ALL_PERIODS[interval]
+    period_codes = periods.get_indexer(stats.index.asfreq(interval[0]))
+    return pd.DataFrame(
+        {
+            col: np.bincount(period_codes, weights=stats[col].to_numpy(dtype=float), minlength=len(periods))
+            .astype(stats[col].dtype)
+            for col in stats.columns
+        },
+        index=periods
+    )
+
 
 def ct_by_submission_date(
     interval: Optional[str] = 'Month',
@@ -44,17 +148,7 @@ def ct_by_submission_date(
     if isinstance(df_capas, str):
         return
 
-    df_capas_ = filtered_df_capas.copy() if filter_by_selection else df_capas.copy()
-    df_capas_ = df_capas_[df_capas_['Status'] == 'Closed']
-
-    period_col = interval + ' of Submission'
-    by_submission_date = (
-        df_capas_.groupby(period_col)
-        .size()
-        .reindex(ALL_PERIODS[interval], fill_value=0)
-    )
-
-    return by_submission_date
+    return get_submission_stats(interval, filter_by_selection)['# Submitted']
 
 
 def compute_avg_time_open(
@@ -81,14 +175,10 @@ def compute_avg_time_open(
     if isinstance(df_capas, str):
         return None
 
-    # Select appropriate dataframe
-    df_capas_ = filtered_df_capas.copy() if filter_by_selection else df_capas.copy()
-    df_capas_ = df_capas_[df_capas_['Status'] == 'Closed']
+    stats = get_submission_stats(interval, filter_by_selection)
 
-    period_col = interval + ' of Submission'
-
-    # Compute average Age per period
-    avg_age = df_capas_.groupby(period_col)['Age'].mean().reindex(ALL_PERIODS[interval])
+    # Periods without any known ages are NaN
+    avg_age = (stats['Total Age'] / stats['# With Age']).where(stats['# With Age'] > 0)
 
     return avg_age
 
@@ -117,22 +207,9 @@ def compute_capa_commitment(
     if isinstance(df_capas, str):
         return
 
-    submitted = ct_by_submission_date(interval, filter_by_selection)
-    if submitted is None or submitted.empty:
-        return
-
-    df_capas_ = filtered_df_capas.copy() if filter_by_selection else df_capas.copy()
-    df_capas_ = df_capas_[df_capas_['Status'] == 'Closed']
-    
-    period_col = interval + ' of Submission'
-    ct_on_time = (
-        df_capas_[df_capas_['Date of Submission'] <= df_capas_['Due Date']]
-        .groupby(period_col)
-        .size()
-        .reindex(ALL_PERIODS[interval], fill_value=0)
-    )
+    stats = get_submission_stats(interval, filter_by_selection)
 
-    commitment = ct_on_time / submitted * 100
+    commitment = compute_pct(stats['# Submitted On Time'], stats['# Submitted'])
 
     return commitment
 
@@ -164,25 +241,9 @@ def compute_capa_effectiveness(
     if isinstance(df_capas, str):
         return
 
-    # Get the count of CAPAs submitted per period
-    submitted = ct_by_submission_date(interval, filter_by_selection)
-
-    # Select appropriate dataframe
-    df_capas_ = filtered_df_capas.copy() if filter_by_selection else df_capas.copy()
-    df_capas_ = df_capas_[df_capas_['Status'] == 'Closed']
-
-    # Count CAPAs that passed effectiveness verification per period
-    passed_col = 'Effectiveness Verification Status'
-    period_col = interval + ' of Submission'
-    ct_passed = (
-        df_capas_[df_capas_[passed_col] == 'Pass']
-        .groupby(period_col)
-        .size()
-        .reindex(ALL_PERIODS[interval], fill_value=0)
-    )
+    stats = get_submission_stats(interval, filter_by_selection)
 
-    # Compute effectiveness percentage
-    effectiveness = ct_passed / submitted * 100
+    effectiveness = compute_pct(stats['# Passed Effectiveness Verification'], stats['# Submitted'])
 
     return effectiveness
 
@@ -210,29 +271,68 @@ def compute_submitted_timely(
     if isinstance(df_capas, str):
         return
 
-    # Get the count of CAPAs submitted per period
-    submitted = ct_by_submission_date(interval, filter_by_selection)
+    stats = get_submission_stats(interval, filter_by_selection)
 
-    # Select appropriate dataframe
-    df_capas_ = filtered_df_capas.copy() if filter_by_selection else df_capas.copy()
-    df_capas_ = df_capas_[df_capas_['Status'] == 'Closed']
-
-    # Count CAPAs submitted within 90 days of creation date
-    period_col = interval + ' of Submission'
-    ct_timely = (
-        df_capas_[df_capas_['Age'] <= 90]
-        .groupby(period_col)
-        .size()
-        .reindex(ALL_PERIODS[interval], fill_value=0)
-    )
-
-    # Compute timely percentage
-    pct_timely = ct_timely / submitted * 100
+    pct_timely = compute_pct(stats['# Submitted Within 90d'], stats['# Submitted'])
 
     return pct_timely
 
 
 def plot_capa_age() -> Union[Tuple[plt.Figure, plt.Axes], str]:
+    """
+    Plots a histogram of the selected open CAPAs by age, highlighting CAPAs older than 1 year.
+    See `plot_capa_age_from_ages`.
+
+    If the "Data" toggle is off or there are no open CAPAs, returns empty axes with a "no data" message
+
+    Returns:
+        Tuple[plt.Figure, plt.Axes]:
+            Matplotlib Figure and Axes objects
+    """
+    if 'data' in st.session_state and not st.session_state['data']:
+        fig, ax = plt.subplots()
+        ax.set_title('CAPA Age')
+        display_no_data_msg('Toggle "Data" on in the sidebar to plot!', fig, ax)
+        return fig, ax
+    
+    open_ages = filtered_df_capas.loc[filtered_df_capas['Status'] == 'Open', 'Age'].to_numpy(dtype=float)
+    if len(open_ages) == 0:
+        fig, ax = plt.subplots()
+        ax.set_title('CAPA Age')
+        display_no_data_msg('No open CAPAs, so cannot plot CAPA age.', fig, ax)
+        return fig, ax
+    
+    return plot_capa_age_from_ages(open_ages[~np.isnan(open_ages)], len(open_ages))
+
+
+@st.cache_data
+def compute_capa_age_hist(ages: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bins open CAPAs by age for the CAPA age histogram.
+
+    Uses a fixed number of equal-width bins, with an extra edge at 365 days so that no bin holds both CAPAs younger
+    and older than 1 year. Cached on the ages, so reruns with the same selection don't rebin.
+
+    Parameters:
+        ages (np.ndarray): Known ages (in days) of the open CAPAs.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]:
+            Number of CAPAs in each bin, and the bin edges (one more than the number of bins)
+    """
+    # Scan for the range once and hand it to np.histogram_bin_edges, which would otherwise scan again.
+    # (0, 1) is numpy's own default range when there are no ages.
+    age_range = (ages.min(), ages.max()) if len(ages) else (0, 1)
+    
+    # Fixed number of equal-width bins, so the number of bars is bounded however spread out the ages are
+    bins = np.histogram_bin_edges(ages, bins=30, range=age_range)
+    if age_range[0] < 365 < age_range[1]:
+        bins = np.union1d(bins, [365])  # So that no bin holds both CAPAs < 1y and >= 1y
+    
+    return np.histogram(ages, bins=bins)
+
+
+def plot_capa_age_from_ages(ages: np.ndarray, n_open: int) -> Tuple[plt.Figure, plt.Axes]:
     """
     Plots a histogram of open CAPAs by age, highlighting CAPAs older than 1 year.
 
@@ -244,8 +344,13 @@ def plot_capa_age() -> Union[Tuple[plt.Figure, plt.Axes], str]:
       - A vertical dotted gray line at 365 days labeled "1y"
       - A red transparent shaded region from 365 days to the end of the plot
       - A red label at the top-right showing the percentage of CAPAs older than 1 year
-      
-    If there are no open CAPAs, returns empty axes with a "no data" message
+
+    The bins come from the cached `compute_capa_age_hist`. The Figure itself is drawn on each rerun, as Figures are
+    not safe to share between sessions.
+
+    Parameters:
+        ages (np.ndarray): Known ages (in days) of the open CAPAs.
+        n_open (int): Number of open CAPAs, including those of unknown age. The denominator of the percentage label.
 
     Returns:
         Tuple[plt.Figure, plt.Axes]:
@@ -254,26 +359,12 @@ def plot_capa_age() -> Union[Tuple[plt.Figure, plt.Axes], str]:
     fig, ax = plt.subplots()
     ax.set_title('CAPA Age')
     
-    if 'data' in st.session_state and not st.session_state['data']:
-        display_no_data_msg('Toggle "Data" on in the sidebar to plot!', fig, ax)
-        return fig, ax
-    
-    open_capas = filtered_df_capas[filtered_df_capas['Status'] == 'Open']
-    if len(open_capas) == 0:
-        display_no_data_msg('No open CAPAs, so cannot plot CAPA age.', fig, ax)
-        return fig, ax
-    
-    open_short = open_capas[open_capas['Age'] < 365]
-    open_long = open_capas[open_capas['Age'] >= 365]
-    
-    # Compute bin width
-    bin_width = compute_bin_width([open_capas['Age']]) / 5
-    overall_min, overall_max = open_capas['Age'].min(), open_capas['Age'].max()
-    bins = np.arange(overall_min, overall_max + bin_width, bin_width)
-    
-    # Plot histograms
-    open_short['Age'].plot(kind='hist', ax=ax, color='green', bins=bins, edgecolor='black')
-    open_long['Age'].plot(kind='hist', ax=ax, color='red', bins=bins, edgecolor='black')
+    # Plot histogram, with bins of CAPAs >= 1y in red
+    cts, edges = compute_capa_age_hist(ages)
+    ax.bar(
+        edges[:-1], cts, width=np.diff(edges), align='edge',
+        color=np.where(edges[:-1] >= 365, 'red', 'green'), edgecolor='black'
+    )
     
     # Vertical line at 365 days
     ax.axvline(365, color='gray', linestyle='dotted', linewidth=1)
@@ -284,7 +375,7 @@ def plot_capa_age() -> Union[Tuple[plt.Figure, plt.Axes], str]:
     ax.axvspan(365, x_max, facecolor='red', alpha=0.1, edgecolor='gray')
     
     # Percent annotation at top-right
-    pct_long = len(open_long) / len(open_capas) * 100
+    pct_long = np.count_nonzero(ages >= 365) / n_open * 100
     ax.text(
         x_max * 0.95, ax.get_ylim()[1] * 0.95,         
         f"{pct_long:.1f}% open >1y",
@@ -301,7 +392,11 @@ def plot_capa_age() -> Union[Tuple[plt.Figure, plt.Axes], str]:
     return fig, ax
 
 
+# Read at module level because the main page imports compute_capa_commitment (only when computing commitment).
+# read_capa_data is a cache_resource, so this is a lookup after the first read
 df_capas = read_capa_data()
+# Only closed CAPAs have submission KPIs. Filter them once rather than in each KPI
+closed_capas = None if isinstance(df_capas, str) else df_capas[df_capas['Status'] == 'Closed']
 
      
 if __name__ == '__main__':  
@@ -312,91 +407,91 @@ if __name__ == '__main__':
         
         render_toggle(release_dates=False)
         interval = render_interval_filter(PAGE_NAME)
-        min_period = df_capas[list(DATE_COLS['CAPAs'])].min().min().to_period(interval[0])
+        min_period = df_capas.attrs['min_date'].to_period(interval[0])
         start, end = render_period_filter(PAGE_NAME, min_period)
         
         filtered_df_capas = render_breakdown_fixed('CAPAs', df_capas)
+        filtered_closed_capas = filtered_df_capas[filtered_df_capas['Status'] == 'Closed']
     
         min_period_msg = ' as earlier CAPAs than this ' + interval.lower() + ' are not tracked in Matrix'
-        period_string = 'during ' + period_str(start, interval) if start == end else 'between ' + period_str(start, interval) + ' and ' + period_str(end, interval)
+        period_string = period_range_str(start, end, interval)
+        # Submission and approval are only counted for closed CAPAs. Count each date column once,
+        # against the subset of CAPAs it applies to.
+        closed_cols = [col for col, short in DATE_COLS['CAPAs'].items() if short in ['Submitted', 'Approved']]
+        capa_cts = {
+            **compute_cts('CAPAs', filtered_df_capas, [col for col in DATE_COLS['CAPAs'] if col not in closed_cols]),
+            **compute_cts('CAPAs', filtered_closed_capas, closed_cols)
+        }
+        interval_lower = interval.lower()
+        # Arguments shared by all the count plots
+        ct_plot_kwargs = dict(
+            min_period=min_period, min_period_msg=min_period_msg, clip_min=0, y_label='# CAPAs', y_integer=True,
+            missing_as_zero=True
+        )
         for col, short in DATE_COLS['CAPAs'].items():
-            df_to_ct = (filtered_df_capas[filtered_df_capas['Status'] == 'Closed'] if short in ['Submitted', 'Approved'] else filtered_df_capas).copy() 
-            capa_cts = compute_cts('CAPAs', df_to_ct)
             total_cts, cts_by_selection = capa_cts[col]
+            short_lower = short.lower()
             plot = plot_bar(
                 PAGE_NAME,
                 total_cts, 
                 grouped_data=cts_by_selection, 
-                min_period=min_period,
-                min_period_msg=min_period_msg,
-                max_period_msg=' as there may be more CAPAs ' + short.lower() + ' this ' + interval.lower(), 
-                clip_min=0,
+                max_period_msg=' as there may be more CAPAs ' + short_lower + ' this ' + interval_lower, 
                 title='# CAPAs ' + short,
-                y_label='# CAPAs',
-                y_integer=True,
-                missing_as_zero=True,
-                no_data_msg=f'No CAPAs meeting the selected criteria were {short.lower()} {period_string}, so cannot plot CAPAs {short.lower()}.'
+                no_data_msg=f'No CAPAs meeting the selected criteria were {short_lower} {period_string}, so cannot plot CAPAs {short_lower}.',
+                **ct_plot_kwargs
             )
             to_display.append(plot[0])
-        commitment_effectiveness_max_period_msg = ' as there may be more CAPAs submitted this ' + interval.lower()
+
+        # Arguments shared by all the plots of KPIs by submission period
+        submission_plot_kwargs = dict(
+            min_period=min_period,
+            min_period_msg=min_period_msg,
+            max_period_msg=' as there may be more CAPAs submitted this ' + interval_lower,
+            x_label='Submission ' + interval,
+            label_missing='No CAPAs submitted'
+        )
         plot = plot_bar(
             PAGE_NAME,
             compute_capa_commitment(interval),
-            min_period=min_period,
-            min_period_msg=min_period_msg,
-            max_period_msg=commitment_effectiveness_max_period_msg,
             title='% CAPAs Submitted by Due Date',
-            x_label='Submission ' + interval,
             y_label='Commitment %',
             is_pct=True,
-            label_missing='No CAPAs submitted',
-            no_data_msg=f'No CAPAs meeting the selected criteria were submitted {period_string}, so cannot plot CAPA commitment.'
+            no_data_msg=f'No CAPAs meeting the selected criteria were submitted {period_string}, so cannot plot CAPA commitment.',
+            **submission_plot_kwargs
         )
         to_display.append(plot[0])
         plot = plot_bar(
             PAGE_NAME,
             compute_capa_effectiveness(interval),
-            min_period=min_period,
-            min_period_msg=min_period_msg,
-            max_period_msg=commitment_effectiveness_max_period_msg,
             title='CAPA Effectiveness',
-            x_label='Submission ' + interval,
             y_label='% passed effectiveness check',
             is_pct=True,
-            label_missing='No CAPAs submitted',
-            no_data_msg=f'No CAPAs meeting the selected criteria were submitted {period_string}, so cannot plot CAPA effectiveness.'
+            no_data_msg=f'No CAPAs meeting the selected criteria were submitted {period_string}, so cannot plot CAPA effectiveness.',
+            **submission_plot_kwargs
         )
         to_display.append(plot[0])
         
         plot = plot_bar(
             PAGE_NAME,
             compute_submitted_timely(interval),
-            min_period=min_period,
-            min_period_msg=min_period_msg,
-            max_period_msg=commitment_effectiveness_max_period_msg,
             title='CAPAs Submitted Within 90d',
-            x_label='Submission ' + interval,
             y_label='% Submitted W/in 90d',
             is_pct=True,
-            label_missing='No CAPAs submitted',
-            no_data_msg=f'No CAPAs meeting the selected criteria were submitted {period_string}, so cannot plot CAPAs submitted in a timely manner.'
+            no_data_msg=f'No CAPAs meeting the selected criteria were submitted {period_string}, so cannot plot CAPAs submitted in a timely manner.',
+            **submission_plot_kwargs
         )
         to_display.append(plot[0])
         
         plot = plot_bar(
             PAGE_NAME,
             compute_avg_time_open(interval),
-            min_period=min_period,
             bar_kwargs={'label': '_nolegend_'},
-            min_period_msg=min_period_msg,
-            max_period_msg=commitment_effectiveness_max_period_msg,
             title='Average Time to Submission',
-            x_label='Submission ' + interval,
             y_label='# Days',
             clip_min=0,
             y_integer=True,
-            label_missing='No CAPAs submitted',
-            no_data_msg=f'No CAPAs were submitted {period_string}, so cannot plot average number of days until closure.'
+            no_data_msg=f'No CAPAs were submitted {period_string}, so cannot plot average number of days until closure.',
+            **submission_plot_kwargs
         )
         to_display.append(plot[0])
             
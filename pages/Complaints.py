@@ -7,17 +7,81 @@ import streamlit as st
 
 from read_data.read_complaints import read_complaint_data
 from read_data.read_usage import read_usage_data
-from utils import compute_cts, init_page, show_data_srcs
+from utils import compute_cts, compute_pct, init_page, show_data_srcs
 from utils.constants import ALL_PERIODS, DATE_COLS
 from utils.filters import render_breakdown_fixed, render_interval_filter, render_period_filter, render_toggle
 from utils.plotting import display_no_data_msg, plot_bar, responsive_columns
-from utils.text_fmt import period_str
+from utils.text_fmt import period_range_str, period_str
 
 
 if __name__ == '__main__':
     init_page('Complaints')
 PAGE_NAME = os.path.splitext(os.path.basename(__file__))[0]
 
+# What is counted in each complaint count plot (e.g., "complaints received"), and the plot's title
+COUNTED = {
+    col: 'complaint investigations completed' if col == 'Investigation Completed Date' else 'complaints ' + short.lower()
+    for col, short in DATE_COLS['Complaints'].items()
+}
+CT_TITLES = {col: '# ' + counted.title() for col, counted in COUNTED.items()}
+
+
+@st.cache_data
+def compute_usage_by_period(
+    devices: Optional[Tuple[str, ...]],
+    interval: str,
+    _data_usage: pd.DataFrame
+) -> Tuple[pd.Series, pd.Series, pd.Period]:
+    """
+    Computes the total number of runs and the number of distinct accounts with usage in each period, for the
+    given devices.
+
+    Cached on the device filter and interval, so reruns that only change other filters (e.g., the period range)
+    don't recount usage. `_data_usage` is not hashed, as it is the shared DataFrame from `read_usage_data`.
+
+    Parameters
+    ----------
+    devices (Optional[Tuple[str, ...]]): Devices whose usage is counted. If None, usage of all devices is counted.
+    interval (str): Time interval to count by ('Month', 'Quarter', 'Year').
+    _data_usage (pd.DataFrame): Usage data, as returned by `read_usage_data`.
+
+    Returns
+    -------
+    Tuple[pd.Series, pd.Series, pd.Period]:
+        usage_by_period (pd.Series): Total number of runs in each period of ALL_PERIODS.
+        accts_by_period (pd.Series): Number of distinct accounts with usage in each period of ALL_PERIODS.
+        min_usage_period (pd.Period): Earliest period with usage of the devices.
+    """
+    usage_col = 'Usage ' + interval
+    # Only the columns read are filtered. Device is categorical, so `isin` compares its codes
+    data_usage_device = _data_usage[[usage_col, 'Number Of Runs', 'Account']]
+    if devices is not None:
+        data_usage_device = data_usage_device[_data_usage['Device'].isin(devices).to_numpy()]
+
+    # Position of each usage record's period in ALL_PERIODS (-1 if not a reporting period), so that sums and counts
+    # by period are bincounts written straight into arrays aligned with ALL_PERIODS
+    periods = ALL_PERIODS[interval]
+    period_codes = periods.get_indexer(data_usage_device[usage_col])
+    has_period = period_codes >= 0
+
+    usage_by_period = pd.Series(
+        np.bincount(
+            period_codes[has_period],
+            weights=data_usage_device['Number Of Runs'].to_numpy(dtype=float, na_value=0)[has_period],  # Sums skip NaN
+            minlength=len(periods)
+        ),
+        index=periods
+    )
+
+    # Number of distinct accounts per period, as the number of distinct (period, account) code pairs in each period
+    acct_codes = data_usage_device['Account'].cat.codes.to_numpy()
+    has_both = has_period & (acct_codes >= 0)
+    n_accts = len(data_usage_device['Account'].cat.categories)
+    pairs = np.unique(period_codes[has_both] * n_accts + acct_codes[has_both])
+    accts_by_period = pd.Series(np.bincount(pairs // n_accts, minlength=len(periods)), index=periods)
+
+    return usage_by_period, accts_by_period, data_usage_device[usage_col].min()
+
 
 def compute_complaint_pct_ratio() -> Tuple[Optional[pd.Series], Optional[pd.Series], Optional[pd.Period], Optional[List[str]]]:
     """
@@ -40,14 +104,12 @@ def compute_complaint_pct_ratio() -> Tuple[Optional[pd.Series], Optional[pd.Seri
         Returns four-tuple of None's if there is no usage data during the user-selected time interval.
     """
     msgs: List[str] = []
-    usage_col = 'Usage ' + interval
 
-    if 'Complaints_Device_filter' in st.session_state:
-        data_usage_device = data_usage[data_usage['Device'].isin(st.session_state['Complaints_Device_filter'])]
-    else:  # Device is not filtered
-        data_usage_device = data_usage
+    devices = st.session_state.get('Complaints_Device_filter')  # None if device is not filtered
+    usage_by_period, accts_by_period, min_usage_period = compute_usage_by_period(
+        None if devices is None else tuple(devices), interval, data_usage
+    )
 
-    min_usage_period = data_usage_device[usage_col].min()
     pct_ratio_start = start
     if pct_ratio_start <= min_usage_period:
         msgs.append(
@@ -58,23 +120,12 @@ def compute_complaint_pct_ratio() -> Tuple[Optional[pd.Series], Optional[pd.Seri
         )
         pct_ratio_start = min_usage_period + 1
 
-    usage_by_period = data_usage_device.groupby(usage_col)['Number Of Runs'].sum().reindex(
-        ALL_PERIODS[interval], fill_value=0
-    )
-    usage_by_period_filtered = usage_by_period[pct_ratio_start:end]
-
-    total_cts, _ = compute_cts('Complaints', filtered_df_complaints)['Complaint Created Date']
-
-    # Check for non-zero usage
-    nonzero_idx = usage_by_period_filtered[usage_by_period_filtered > 0].index
-    if len(nonzero_idx) == 0:
+    if not (usage_by_period[pct_ratio_start:end] > 0).any():
         return None, None, None, None
 
-    complaint_pct = total_cts / usage_by_period * 100
+    total_cts, _ = complaint_cts['Complaint Created Date']  # Already counted for the plots
 
-    accts_by_period = data_usage_device.groupby(usage_col)['Account'].nunique().reindex(
-        ALL_PERIODS[interval], fill_value=0
-    )
+    complaint_pct = total_cts / usage_by_period * 100
     complaint_ratio = total_cts / accts_by_period
 
     if pct_ratio_start != start:
@@ -110,13 +161,42 @@ def compute_complaint_commitment(
     if isinstance(df_complaints, str):
         return None
 
-    df_complaints_ = filtered_df_complaints.copy() if filter_by_device else df_complaints.copy()
-
+    df_complaints_ = filtered_df_complaints if filter_by_device else df_complaints
     period_col = 'Completed ' + interval
-    cts_by_period = df_complaints_.groupby(period_col).size().reindex(ALL_PERIODS[interval], fill_value=0)
-    cts_le60_by_period = df_complaints_[df_complaints_['# Days Open'] <= 60].groupby(period_col).size().reindex(ALL_PERIODS[interval], fill_value=0)
 
-    commitment = cts_le60_by_period / cts_by_period.replace(0, np.nan) * 100
+    # Only the columns read are passed, so hashing for the cache is cheap
+    return compute_complaint_commitment_from_df(df_complaints_[[period_col, 'Closed Within 60d']], period_col)
+
+
+@st.cache_data
+def compute_complaint_commitment_from_df(df: pd.DataFrame, period_col: str) -> pd.Series:
+    """
+    Computes the percentage of the complaints in `df` that were open for 60 days or fewer, for each completion period.
+
+    Cached on the complaints and period column, so reruns that don't change the complaint filters or interval
+    reuse the result.
+
+    Parameters
+    ----------
+    df (pd.DataFrame): Complaints, with the completion period column and "Closed Within 60d".
+    period_col (str): Name of the completion period column (e.g., "Completed Month").
+
+    Returns
+    -------
+    pd.Series: Series indexed by period, containing complaint commitment percentages.
+    """
+    # Completion periods are categoricals over ALL_PERIODS, so bincounts of their codes count every period. A single
+    # bincount over (period, closed within 60d) pairs gives both the counts and the counts closed within 60d
+    periods = df[period_col].cat
+    codes = periods.codes.to_numpy().astype(np.intp)
+    has_period = codes >= 0  # Complaints not yet completed have code -1
+    le60 = df['Closed Within 60d'].to_numpy()
+    n_periods = len(periods.categories)
+    cts = np.bincount(codes[has_period] * 2 + le60[has_period], minlength=n_periods * 2).reshape(n_periods, 2)
+    cts_by_period = pd.Series(cts.sum(axis=1), index=periods.categories)
+    cts_le60_by_period = pd.Series(cts[:, 1], index=periods.categories)
+
+    commitment = compute_pct(cts_le60_by_period, cts_by_period)
 
     return commitment
 
@@ -142,13 +222,22 @@ if __name__ == '__main__':
         
         render_toggle()
         interval = render_interval_filter(PAGE_NAME)
-        min_period = df_complaints[list(DATE_COLS['Complaints'])].min().min().to_period(interval[0])
+        min_period = df_complaints.attrs['min_date'].to_period(interval[0])
         start, end = render_period_filter(PAGE_NAME, min_period)
 
         filtered_df_complaints = render_breakdown_fixed('Complaints', df_complaints)
 
-        period_string = ' in ' + period_str(start, interval) if start == end else ' between ' + period_str(start, interval) + ' and ' + period_str(end, interval)
+        period_string = ' ' + period_range_str(start, end, interval, 'in')
         complaint_cts = compute_cts('Complaints', filtered_df_complaints)
+        interval_lower = interval.lower()
+        # Arguments shared by all the count plots
+        ct_plot_kwargs = dict(
+            min_period=min_period,
+            min_period_msg=' as Rad did not implement the current complaint process until partway through the ' + interval_lower,
+            clip_min=0,
+            y_label='# complaints',
+            y_integer=True
+        )
         for col, short in DATE_COLS['Complaints'].items():
             total_cts, cts_by_status = complaint_cts[col]
             plot = plot_bar(
@@ -156,22 +245,18 @@ if __name__ == '__main__':
                 total_cts,
                 grouped_data=cts_by_status,
                 release_dates=short in ['Opened', 'Received'],
-                min_period=min_period, 
-                min_period_msg=' as Rad did not implement the current complaint process until partway through the ' + interval.lower(), 
-                max_period_msg=' as there may be more ' + ('complaint investigations completed' if col == 'Investigation Completed Date' else 'complaints ' + DATE_COLS['Complaints'][col].lower()) + ' this ' + interval.lower(), 
-                clip_min=0,
-                title='# Complaint Investigations Completed' if col == 'Investigation Completed Date' else '# Complaints ' + DATE_COLS['Complaints'][col],
-                y_label='# complaints',
-                y_integer=True,
-                no_data_msg=f'No complaints meeting the specified criteria were {short.lower()}{period_string}.'
+                max_period_msg=' as there may be more ' + COUNTED[col] + ' this ' + interval_lower, 
+                title=CT_TITLES[col],
+                no_data_msg=f'No complaints meeting the specified criteria were {short.lower()}{period_string}.',
+                **ct_plot_kwargs
             )
             to_display.append(plot[0])
 
         complaint_pct_title, complaint_ratio_title = 'Opened Complaints as % of Usage', 'Avg # Complaints per Account'
         if isinstance(data_usage, str):
             to_display.extend([
-                display_no_data_msg(f'Cannot compute complaint percentage as there is no usage data {period_str}.', title=complaint_pct_title)[0],
-                display_no_data_msg(f'Cannot compute complaint ratio as there is no usage data {period_str}.', title=complaint_ratio_title)[0]
+                display_no_data_msg(f'Cannot compute complaint percentage as there is no usage data{period_string}.', title=complaint_pct_title)[0],
+                display_no_data_msg(f'Cannot compute complaint ratio as there is no usage data{period_string}.', title=complaint_ratio_title)[0]
             ])
         else:
             complaint_pct, complaint_ratio, pct_ratio_start, msgs = compute_complaint_pct_ratio()
@@ -7,7 +7,7 @@ from utils import compute_cts, init_page, show_data_srcs
 from utils.constants import DATE_COLS
 from utils.filters import render_breakdown_fixed, render_interval_filter, render_period_filter, render_toggle
 from utils.plotting import plot_bar, responsive_columns
-from utils.text_fmt import period_str
+from utils.text_fmt import period_range_str
 
 
 if __name__ == '__main__':
@@ -22,7 +22,7 @@ if __name__ == '__main__':
     if not isinstance(df_issues, str):
         render_toggle()
         interval = render_interval_filter(PAGE_NAME)
-        min_period = df_issues[list(DATE_COLS['Development Tickets'])].min().min().to_period(interval[0])
+        min_period = df_issues.attrs['min_date'].to_period(interval[0])
         start, end = render_period_filter(PAGE_NAME, min_period)
         
         filtered_df_issues = render_breakdown_fixed('Development Tickets', df_issues)
@@ -30,23 +30,28 @@ if __name__ == '__main__':
         to_display = []
         
         issue_cts = compute_cts('Development Tickets', filtered_df_issues)
-        min_period_msg = ' as earlier tickets than this ' + interval.lower() + ' are not tracked in Jira'
-        period_string = 'during ' + period_str(start, interval) if start == end else 'between ' + period_str(start, interval) + ' and ' + period_str(end, interval)
+        interval_lower = interval.lower()
+        period_string = period_range_str(start, end, interval)
+        # Arguments shared by all the count plots
+        ct_plot_kwargs = dict(
+            min_period=min_period,
+            min_period_msg=' as earlier tickets than this ' + interval_lower + ' are not tracked in Jira',
+            clip_min=0,
+            y_label='# Tickets',
+            y_integer=True
+        )
         for col, short in DATE_COLS['Development Tickets'].items():
             total_cts, cts_by_selection = issue_cts[col]
+            short_lower = short.lower()
             plot = plot_bar(
                 PAGE_NAME,
                 total_cts,
                 grouped_data=cts_by_selection,
                 release_dates=short == 'Created',
-                min_period=min_period,
-                min_period_msg=min_period_msg,
-                max_period_msg=' as there may be more tickets ' + short.lower() + ' this ' + interval.lower(), 
-                clip_min=0,
+                max_period_msg=' as there may be more tickets ' + short_lower + ' this ' + interval_lower, 
                 title='# Tickets ' + short,
-                y_label='# Tickets',
-                y_integer=True,
-                no_data_msg=f'No tickets meeting the selected criteria were {short.lower()} {period_string}.'
+                no_data_msg=f'No tickets meeting the selected criteria were {short_lower} {period_string}.',
+                **ct_plot_kwargs
             )
             to_display.append(plot[0])
         
@@ -41,16 +41,14 @@ if __name__ == '__main__':
             ax.set_ylabel('# Datasets')
             ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
 
-            # Compute bin width
-            series_list = [df_plot[col] for col in hist_cols]
-            bin_width = compute_bin_width(series_list)
-            overall_min = min(s.min() for s in series_list)
-            overall_max = max(s.max() for s in series_list)
-            bins = np.arange(overall_min, overall_max + bin_width, bin_width)
+            # Compute bin width and range from one array of both columns' sizes
+            sizes = df_plot[hist_cols].to_numpy(dtype=float)
+            bin_width = compute_bin_width([sizes])
+            bins = np.arange(np.nanmin(sizes), np.nanmax(sizes) + bin_width, bin_width)
 
             # Plot each histogram separately so they overlap
-            for s, label in zip(series_list, labels):
-                ax.hist(s, bins=bins, alpha=0.5, edgecolor='black', label=label)
+            for sizes_, label in zip(sizes.T, labels):
+                ax.hist(sizes_, bins=bins, alpha=0.5, edgecolor='black', label=label)
             ax.set_xlabel('Dataset Size')
             ax.set_ylabel('# Structures')
             ax.legend()
@@ -11,11 +11,11 @@ import pandas as pd
 import streamlit as st
 
 from read_data.read_training import read_training_data
-from utils import init_page, show_data_srcs
+from utils import compute_pct, get_period_range, init_page, show_data_srcs
 from utils.constants import ALL_PERIODS, INTERVALS, RAD_COLOR
 from utils.filters import render_interval_filter, render_period_filter, render_toggle
 from utils.plotting import display_no_data_msg, plot_bar, responsive_columns
-from utils.text_fmt import period_str
+from utils.text_fmt import period_range_str
 
 
 if __name__ == '__main__':
@@ -28,9 +28,9 @@ def get_training_by_qtr_yr(df_training_mo: pd.DataFrame) -> List[pd.DataFrame]:
     """
     Aggregates monthly training data into quarterly and yearly summaries per user.
 
-    Groups the input DataFrame by consecutive rows with the same user and quarter/year,
-    summing numeric columns for each group. A `GroupID` is used to preserve continuity
-    when multiple records exist for the same user in the same period.
+    Sums the training counts of each user in each quarter/year with one bincount per count column over
+    (period, user) codes, then recomputes "% Training Complete" from the summed counts, as `read_training_data`
+    does for each month.
 
     Parameters
     ----------
@@ -44,19 +44,27 @@ def get_training_by_qtr_yr(df_training_mo: pd.DataFrame) -> List[pd.DataFrame]:
         the summed numeric training metrics.
         Index 0 corresponds to quarterly aggregation, index 1 to yearly aggregation.
     """
+    user_codes, users = pd.factorize(df_training_mo['User'])
+    ct_cols = [col for col in df_training_mo.columns if col not in INTERVALS + ['User', '% Training Complete']]
+    cts = {col: df_training_mo[col].to_numpy(dtype=float) for col in ct_cols}
+
     by_period = []
     for interval_ in ['Quarter', 'Year']:
-        df_training_by_period = df_training_mo.copy()
-        group = (
-            (df_training_by_period[interval_] != df_training_by_period[interval_].shift())
-            | (df_training_by_period['User'] != df_training_by_period['User'].shift())
-        )
-        df_training_by_period['GroupID'] = group.cumsum()
-        numeric_cols = [col for col in df_training_by_period.columns if col not in INTERVALS]
-        df_training_by_period = (
-            df_training_by_period.groupby(['GroupID', interval_, 'User'], as_index=False)[numeric_cols]
-            .sum()
-            .drop(columns='GroupID')
+        period_codes, periods = pd.factorize(df_training_mo[interval_], sort=True)
+
+        # Each (period, user) pair present, in period then user order, and the pair of each monthly record
+        pairs, pair_codes = np.unique(period_codes * len(users) + user_codes, return_inverse=True)
+        df_training_by_period = pd.DataFrame({
+            interval_: periods[pairs // len(users)],
+            'User': users[pairs % len(users)],
+            **{
+                col: np.bincount(pair_codes, weights=vals, minlength=len(pairs)).astype(np.int64)
+                for col, vals in cts.items()
+            }
+        })
+        df_training_by_period['% Training Complete'] = compute_pct(
+            df_training_by_period['# Trainings Completed'],
+            df_training_by_period['# Trainings Completed'] + df_training_by_period['# Open Trainings']
         )
         by_period.append(df_training_by_period)
 
@@ -72,7 +80,9 @@ def compute_training_commitment(
     Computes the percentage of trainings completed on time for each interval (Month, Quarter, Year).
 
     For each interval:
-    - Aggregates the number of trainings completed and completed on time.
+    - Aggregates the number of trainings completed and completed on time. Monthly records are summed
+      once with bincounts into arrays aligned with ALL_PERIODS, and the monthly sums are rolled up into
+      quarters and years.
     - Calculates the percentage of trainings completed on time.
     - Reindexes the result to cover the full range from `min_period` to `max_period`, filling missing values with 0.
 
@@ -90,48 +100,78 @@ def compute_training_commitment(
         of "% Trainings Completed on Time" as values, indexed by period.
         Returns None if training data was not retrieved.
     """
-    if isinstance(dfs_training, str):
+    if not isinstance(df_training_mo, pd.DataFrame):
         return None
 
-    commitment = {}
-    for interval_ in INTERVALS:
-        periods = (
-            ALL_PERIODS[interval_]
-            if min_period is None
-            else pd.period_range(start=min_period, end=max_period, freq=interval_[0])
+    # Completed and on-time counts summed into arrays aligned with the months in ALL_PERIODS, from which the
+    # quarterly and yearly counts are rolled up
+    months = ALL_PERIODS['Month']
+    month_codes = months.get_indexer(df_training_mo['Month'])
+    has_month = month_codes >= 0
+    cts_by_mo = {
+        col: np.bincount(
+            month_codes[has_month],
+            weights=df_training_mo[col].to_numpy(dtype=float)[has_month],
+            minlength=len(months)
         )
+        for col in ['# Trainings Completed', '# Trainings Completed on Time']
+    }
 
-        df_training_grouped = dfs_training[interval_].groupby(
-            interval_, as_index=False
-        )[
-            [col for col in dfs_training[interval_].columns if col not in INTERVALS]
-        ].sum()
-
-        df_training_grouped['% Trainings Completed on Time'] = (
-            df_training_grouped['# Trainings Completed on Time']
-            / df_training_grouped['# Trainings Completed'].replace(0, np.nan)
-            * 100
-        )
+    commitment = {}
+    for interval_ in INTERVALS:
+        if interval_ == 'Month':
+            cts = cts_by_mo
+        else:
+            # Position of each month's quarter/year in ALL_PERIODS
+            codes = ALL_PERIODS[interval_].get_indexer(months.asfreq(interval_[0]))
+            has_period = codes >= 0
+            cts = {
+                col: np.bincount(codes[has_period], weights=cts_[has_period], minlength=len(ALL_PERIODS[interval_]))
+                for col, cts_ in cts_by_mo.items()
+            }
 
-        df_training_grouped = (
-            pd.DataFrame({interval_: periods})
-            .merge(df_training_grouped, on=interval_, how='left')
-            .set_index(interval_)
-            .fillna(0)
-        )
+        pct = compute_pct(
+            pd.Series(cts['# Trainings Completed on Time'], index=ALL_PERIODS[interval_]),
+            pd.Series(cts['# Trainings Completed'], index=ALL_PERIODS[interval_])
+        ).fillna(0)
+        if min_period is not None:
+            pct = pct.reindex(get_period_range(interval_, min_period, max_period), fill_value=0)
 
-        commitment[interval_] = df_training_grouped['% Trainings Completed on Time']
+        commitment[interval_] = pct.rename_axis(interval_).rename('% Trainings Completed on Time')
 
     return commitment
     
     
+@st.cache_data
+def compute_training_completion_hist(pcts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bins employees' training completion percentages for the training completion histogram.
+
+    Binned with NumPy, which is what `ax.hist` does with more per-call overhead. NaN (no trainings assigned) is
+    skipped, as `ax.hist` skips it. Cached on the percentages, so reruns with the same data don't rebin.
+
+    Parameters
+    ----------
+    pcts (np.ndarray): Training completion percentages, one per employee.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]:
+        cts (np.ndarray): Number of employees in each bin.
+        edges (np.ndarray): Bin edges (percentages), one more than the number of bins.
+    """
+    return np.histogram(pcts[~np.isnan(pcts)])
+
+
 def plot_training_completion() -> Tuple[Figure, Axes]:
     """
     Plots a histogram of employees' training completion percentages for the current period.
 
     Checks whether any training records exist for the current period within the user-selected
     `interval` (value from INTERVALS). If records are present, generates a histogram showing
-    the distribution of '% Training Complete' across employees.
+    the distribution of '% Training Complete' across employees. The bins come from the cached
+    `compute_training_completion_hist`; the Figure is drawn on each rerun, as Figures are not safe to share between
+    sessions.
     
     If there is no data to plot, displays such a message in the empty Axes.
 
@@ -150,37 +190,34 @@ def plot_training_completion() -> Tuple[Figure, Axes]:
     curr_period_training = dfs_training[interval][
         dfs_training[interval][interval] == ALL_PERIODS[interval][-1]
     ]
-    fig, ax = plt.subplots()
     title = 'Training Completion as of ' + datetime.now().strftime('%Y-%m-%d')
     if 'data' in st.session_state and not st.session_state['data']:
+        fig, ax = plt.subplots()
         display_no_data_msg('Toggle "Data" in the sidebar to plot!', fig, ax, title)
-    elif len(curr_period_training) == 0:
+        return fig, ax
+    if len(curr_period_training) == 0:
+        fig, ax = plt.subplots()
         display_no_data_msg(f'No training was assigned for this {interval.lower()}, so cannot plot training completion.', fig, ax, title)
-    else:
-        ax.grid(axis='y', alpha=0.7, zorder=1)
-
-        cts, _, _ = ax.hist(
-            curr_period_training['% Training Complete'],
-            color=RAD_COLOR,
-            edgecolor='black',
-            zorder=2
-        )
+        return fig, ax
 
-        ax.set_xlim(0, 100)
-        ax.set_ylim(0, max(cts))
-        ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
-        ax.set_xlabel('% Complete')
-        ax.set_ylabel('# Employees')
-        ax.set_title(title)
+    cts, edges = compute_training_completion_hist(curr_period_training['% Training Complete'].to_numpy(dtype=float))
+
+    fig, ax = plt.subplots()
+    ax.grid(axis='y', alpha=0.7, zorder=1)
+
+    ax.bar(edges[:-1], cts, width=np.diff(edges), align='edge', color=RAD_COLOR, edgecolor='black', zorder=2)
+
+    ax.set_xlim(0, 100)
+    ax.set_ylim(0, max(cts))
+    ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
+    ax.set_xlabel('% Complete')
+    ax.set_ylabel('# Employees')
+    ax.set_title(title)
 
     return fig, ax
      
      
 df_training_mo = read_training_data()
-dfs_training = None
-if isinstance(df_training_mo, pd.DataFrame):
-    by_qtr, by_yr = get_training_by_qtr_yr(df_training_mo)
-    dfs_training = {'Month': df_training_mo, 'Quarter': by_qtr, 'Year': by_yr}
 
 
 if __name__ == '__main__':
@@ -188,17 +225,22 @@ if __name__ == '__main__':
     st.markdown('**Note**: This is dummy data! REAL QMS training stats will be provided once we roll out QMS training in Matrix!')
     show_data_srcs('Training', df_training_mo if isinstance(df_training_mo, str) else None)
     if not isinstance(df_training_mo, str):
+        # Per-user quarterly and yearly totals are only needed for the completion histogram, so they aren't
+        # computed when this module is imported for compute_training_commitment
+        by_qtr, by_yr = get_training_by_qtr_yr(df_training_mo)
+        dfs_training = {'Month': df_training_mo, 'Quarter': by_qtr, 'Year': by_yr}
+
         render_toggle(release_dates=False)
         interval = render_interval_filter(PAGE_NAME)
         training_commitment_percentage = compute_training_commitment()
-        min_period = df_training_mo[interval].min()
+        min_period = df_training_mo[interval].iloc[0]  # Rows are sorted by month
         start, end = render_period_filter(PAGE_NAME, min_period)
 
         to_display = []
-        period_string = 'during ' + period_str(start, interval) if start == end else 'between ' + period_str(start, interval) + ' and ' + period_str(end, interval)
+        period_string = period_range_str(start, end, interval)
         plot = plot_bar(
             PAGE_NAME,
-            compute_training_commitment()[interval],
+            training_commitment_percentage[interval],
             interval=interval,
             start=start,
             end=end,
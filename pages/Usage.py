@@ -1,15 +1,14 @@
 import os
 
-import pandas as pd
 import streamlit as st
 
 from read_data.read_usage import read_usage_data
-from utils import init_page, show_data_srcs
+from utils import get_period_range, init_page, show_data_srcs
 from utils.constants import ALL_PERIODS
 from utils.filters import render_breakdown_fixed, render_interval_filter, render_period_filter, render_toggle
 from utils.plotting import display_no_data_msg, plot_bar, responsive_columns
 from utils.settings import get_settings
-from utils.text_fmt import period_str
+from utils.text_fmt import period_range_str
 
 
 if __name__ == '__main__':
@@ -27,11 +26,11 @@ if __name__ == '__main__':
         
         render_toggle()
         interval = render_interval_filter(PAGE_NAME)
-        min_period = df_usage['Usage ' + interval].min()
+        min_period = df_usage.attrs['min_date'].to_period(interval[0])
         max_period = ALL_PERIODS[interval][-1]
         start, end = render_period_filter(PAGE_NAME, min_period)
         filtered_df_usage = render_breakdown_fixed(PAGE_NAME, df_usage)
-        ct_data = filtered_df_usage.groupby('Usage ' + interval)['Number Of Runs'].sum().reindex(pd.period_range(start=min_period, end=max_period, freq=interval[0]), fill_value=0)
+        ct_data = filtered_df_usage.groupby('Usage ' + interval, sort=False)['Number Of Runs'].sum().reindex(get_period_range(interval, min_period, max_period), fill_value=0)
 
         to_display = []
         plot = plot_bar(
@@ -47,7 +46,7 @@ if __name__ == '__main__':
             max_period_msg=f' as we don\'t yet have all data for this {interval.lower()}',
             clip_min=0,
             title='Usage Volume',
-            no_data_msg='No usage matching your criteria occurred' + (' during ' + period_str(start, interval) if start == end else ' between ' + period_str(start, interval) + ' and ' + period_str(end, interval)) + '.',
+            no_data_msg='No usage matching your criteria occurred' + ' ' + period_range_str(start, end, interval) + '.',
             omit_legend_entries=['Number Of Runs']
         )
         to_display.append(plot[0])
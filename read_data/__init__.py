@@ -1,11 +1,29 @@
+import logging
+import os
+import time
 from typing import List, Optional
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
-from utils.constants import INTERVALS
+from utils.constants import ALL_PERIODS, INTERVALS
 
 
-def add_period_cols(df: pd.DataFrame, cols: Optional[List[str]] = None) -> None:
+logger = logging.getLogger(__name__)
+
+# On-disk cache of DataFrames read from external sources, so that a restarted app doesn't
+# have to query the sources again. The cached QMS records (audits, CAPAs, AEs) are not encrypted,
+# so the cache is kept outside the deployed app directory, in a directory only the app's user can
+# read. Set RAQA_KPIS_CACHE_DIR to put it elsewhere (e.g., an encrypted volume).
+DF_CACHE_DIR = os.environ.get(
+    'RAQA_KPIS_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'raqa-kpis')
+)
+DF_CACHE_TTL = 60 * 60  # Seconds
+
+
+def add_period_cols(df: pd.DataFrame, cols: Optional[List[str]] = None, categorical: bool = False) -> None:
     """
     Adds columns for the month, quarter, and year in which the date values lie.
 
@@ -13,6 +31,9 @@ def add_period_cols(df: pd.DataFrame, cols: Optional[List[str]] = None) -> None:
         df (pd.DataFrame): DataFrame to add the columns to.
         cols (Optional[List[str]]): Column names to create new columns based on. 
                                     If not provided, uses all columns whose names include 'Date'.
+        categorical (bool): If True, the new columns are categoricals over ALL_PERIODS (see `to_period_categorical`).
+                            Arrow can't store these, so leave False for DataFrames written to the disk cache.
+                            Defaults to False.
         
     Example:
         >>> df = pd.DataFrame({'Created Date': ['2023-01-15', '2023-04-20']})
@@ -25,9 +46,40 @@ def add_period_cols(df: pd.DataFrame, cols: Optional[List[str]] = None) -> None:
     """
     if cols is None:
         cols = [col for col in df.columns if 'Date' in col]
+
+    # Convert each date column to months once. Monthly period ordinals count months since 1970-01, so quarter
+    # and year ordinals are plain integer division (NaT ordinals are kept as is)
+    months = {col: df[col].dt.to_period('M') for col in cols}
+    months_per_period = {'Month': 1, 'Quarter': 3, 'Year': 12}
     for interval_ in INTERVALS:
         for col in cols:
-            df[col.replace('Date', interval_)] = df[col].dt.to_period(interval_[0])
+            if interval_ == 'Month':
+                periods = months[col]
+            else:
+                ordinals = months[col].array.asi8
+                ordinals = np.where(months[col].isna().to_numpy(), ordinals, ordinals // months_per_period[interval_])
+                periods = pd.Series(pd.arrays.PeriodArray(ordinals, dtype=pd.PeriodDtype(interval_[0])), index=df.index)
+            df[col.replace('Date', interval_)] = to_period_categorical(periods, interval_) if categorical else periods
+
+
+def to_period_categorical(periods: pd.Series, interval: str) -> pd.Categorical:
+    """
+    Converts periods to a categorical whose categories are ALL_PERIODS[interval].
+
+    Counting the categorical's codes (e.g., with `np.bincount`) gives counts for every reporting period in order,
+    and grouping on it groups by integer code. Periods outside ALL_PERIODS become missing.
+
+    Parameters:
+        periods (pd.Series): Periods of the given interval.
+        interval (str): Interval of the periods ('Month', 'Quarter', or 'Year').
+
+    Returns:
+        pd.Categorical: Ordered categorical of the periods.
+    """
+    return pd.Categorical.from_codes(
+        ALL_PERIODS[interval].get_indexer(periods),
+        dtype=pd.CategoricalDtype(ALL_PERIODS[interval], ordered=True)
+    )
 
 
 def correct_date_dtype(
@@ -60,4 +112,69 @@ def correct_date_dtype(
     )
     df[date_columns] = df[date_columns].apply(lambda col: col.dt.tz_localize(None))
     return df
-          
\ No newline at end of file
+
+
+def read_df_cache(
+    name: str,
+    ttl: float = DF_CACHE_TTL,
+    columns: Optional[List[str]] = None
+) -> Optional[pd.DataFrame]:
+    """
+    Reads a DataFrame previously written to the on-disk cache by `write_df_cache`.
+
+    DataFrames are stored in the Arrow IPC (Feather) format, which is read back column by column
+    rather than unpickled. Arrow returns list values as NumPy arrays, so these are converted back
+    to lists.
+
+    Parameters:
+        name (str): Name the DataFrame was cached under.
+        ttl (float): Maximum age, in seconds, of a cached DataFrame. Defaults to DF_CACHE_TTL.
+        columns (Optional[List[str]]): Columns the cached DataFrame must have, e.g., those that the caller
+                                       derives further columns from. Defaults to None (no check).
+
+    Returns:
+        Optional[pd.DataFrame]: The cached DataFrame, or None if there is no cached DataFrame by that name,
+                                it is older than `ttl`, it could not be read, or it is missing any of
+                                `columns` (e.g., it was written by an older version of the app). Read
+                                failures and missing columns are logged.
+    """
+    path = os.path.join(DF_CACHE_DIR, name + '.feather')
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        df = pd.read_feather(path)
+    except FileNotFoundError:  # Not cached yet
+        return None
+    except (OSError, pa.ArrowInvalid):  # Unreadable cache -> read from the source instead
+        logger.warning('Could not read cached DataFrame %r from %s', name, path, exc_info=True)
+        return None
+
+    missing_cols = [] if columns is None else [col for col in columns if col not in df.columns]
+    if missing_cols:
+        logger.warning('Ignoring cached DataFrame %r, which is missing columns %s', name, missing_cols)
+        return None
+
+    for col in df.columns[df.dtypes == object]:
+        if df[col].map(lambda x: isinstance(x, np.ndarray)).any():
+            df[col] = df[col].map(lambda x: list(x) if isinstance(x, np.ndarray) else x)
+    return df
+
+
+def write_df_cache(name: str, df: pd.DataFrame) -> None:
+    """
+    Writes a DataFrame to the on-disk cache, to be read by `read_df_cache`.
+
+    Failure to write the file (e.g., read-only file system) or invalid data is logged rather than
+    raised, as the cache is only an optimization. Other errors (e.g., a column type that Arrow can't
+    store) are raised so that they are fixed rather than silently disabling the cache.
+
+    Parameters:
+        name (str): Name to cache the DataFrame under.
+        df (pd.DataFrame): DataFrame to cache.
+    """
+    path = os.path.join(DF_CACHE_DIR, name + '.feather')
+    try:
+        os.makedirs(DF_CACHE_DIR, mode=0o700, exist_ok=True)
+        df.to_feather(path)
+    except (OSError, pa.ArrowInvalid):
+        logger.warning('Could not cache DataFrame %r to %s', name, path, exc_info=True)
@@ -5,11 +5,11 @@ import pandas as pd
 import requests
 import streamlit as st
 
-from read_data import add_period_cols
-from utils.constants import RAD_DATE
+from read_data import add_period_cols, read_df_cache, write_df_cache
+from utils.constants import BREAKDOWN_COLS, RAD_DATE
 
 
-@st.cache_data
+@st.cache_resource
 def read_ae_data() -> Union[pd.DataFrame, str]:
     """
     Returns a `DataFrame` of adverse event data for certain device types, from the FDA AE database 
@@ -18,6 +18,7 @@ def read_ae_data() -> Union[pd.DataFrame, str]:
     The function fetches AE reports from the FDA API, normalizes manufacturer and device names, 
     converts date fields to `datetime`, and adds period columns for month, quarter, and year using 
     `add_period_cols`. Restricts results to those received since Rad was incorporated.
+    The results are also cached on disk, and read from there if recent enough.
 
     Returns:
         Union[pd.DataFrame, str]: A `DataFrame` containing adverse event data, or an error string if
@@ -82,6 +83,10 @@ def read_ae_data() -> Union[pd.DataFrame, str]:
             name = 'XIO'
         return name
 
+    df_aes = read_df_cache('aes')
+    if df_aes is not None:
+        return df_aes
+
     device_names = [
         'Radiological Image Processing Software For Radiation Therapy', 
         'System, Planning, Radiation Therapy Treatment'
@@ -97,21 +102,27 @@ def read_ae_data() -> Union[pd.DataFrame, str]:
         params={'search': search_query, 'limit': 1000},
     ).json()
 
-    if 'error' in res:
-        if res['error'] != 'NOT_FOUND':
-            return res['error']
-    else:
-        aes = []
-        for ae in res['results']:
-            aes.append({
-                'Manufacturer': normalize_manufacturer_name(ae['device'][0]['manufacturer_d_name']),
-                'Device': normalize_device_name(ae['device'][0]['brand_name']),
-                'Device Type': ae['device'][0]['openfda']['device_name'],
-                'Date of Event': pd.NaT if 'date_of_event' not in ae else pd.to_datetime(ae['date_of_event'], format='%Y%m%d'),
-                'Date Received': pd.to_datetime(ae['date_received'], format='%Y%m%d'),
-                'Event Type': 'Unknown' if ae['event_type'] == 'No answer provided' else ae['event_type']
-            })
-        df_aes = pd.DataFrame.from_records(aes)
+    if 'error' in res and res['error'] != 'NOT_FOUND':
+        return res['error']
+
+    aes = []
+    for ae in res.get('results', []):  # No results if no AEs were found
+        aes.append({
+            'Manufacturer': normalize_manufacturer_name(ae['device'][0]['manufacturer_d_name']),
+            'Device': normalize_device_name(ae['device'][0]['brand_name']),
+            'Device Type': ae['device'][0]['openfda']['device_name'],
+            'Date of Event': pd.NaT if 'date_of_event' not in ae else pd.to_datetime(ae['date_of_event'], format='%Y%m%d'),
+            'Date Received': pd.to_datetime(ae['date_received'], format='%Y%m%d'),
+            'Event Type': 'Unknown' if ae['event_type'] == 'No answer provided' else ae['event_type']
+        })
+    # Columns and date types given explicitly so that they are also there if no AEs were found
+    df_aes = pd.DataFrame.from_records(
+        aes, columns=['Manufacturer', 'Device', 'Device Type', 'Date of Event', 'Date Received', 'Event Type']
+    ).astype({'Date of Event': 'datetime64[ns]', 'Date Received': 'datetime64[ns]'})
+
+    # Breakdown columns are only grouped on and filtered by, so store them as categoricals
+    df_aes[BREAKDOWN_COLS['Adverse Events']] = df_aes[BREAKDOWN_COLS['Adverse Events']].astype('category')
 
     add_period_cols(df_aes)
+    write_df_cache('aes', df_aes)
     return df_aes
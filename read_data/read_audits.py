@@ -4,7 +4,7 @@ from typing import List, Union
 import pandas as pd
 import streamlit as st
 
-from read_data import add_period_cols, correct_date_dtype
+from read_data import add_period_cols, correct_date_dtype, read_df_cache, write_df_cache
 from read_data.matrix import get_item_title, get_matrix_items, get_multiselect, map_dropdown_ids
 from utils.constants import DATE_COLS
 
@@ -51,7 +51,7 @@ def create_findings_df(df_audits):
     return df
 
 
-@st.cache_data
+@st.cache_resource
 def read_audit_data() -> Union[pd.DataFrame, str]:
     """
     Returns a DataFrame of audit data from Matrix.
@@ -59,6 +59,8 @@ def read_audit_data() -> Union[pd.DataFrame, str]:
     The function retrieves audit items from the Matrix QMS project; converts date columns to datetime;
     maps dropdown IDs to human-readable labels; fills missing values; and adds period columns for month, 
     quarter, and year.
+    
+    The results are also cached on disk, and read from there if recent enough.
 
     Returns:
         Union[pd.DataFrame, str]: Audit data as a DataFrame, or an error message string if 
@@ -96,6 +98,10 @@ def read_audit_data() -> Union[pd.DataFrame, str]:
 
         # Otherwise assume string, split on commas
         return [item.strip() for item in str(x).split(',') if item.strip()]
+
+    df_audits, findings_df = read_df_cache('audits'), read_df_cache('audit_findings')
+    if df_audits is not None and findings_df is not None:
+        return df_audits, findings_df
          
     matrix_items = get_matrix_items('AUDIT')
     if isinstance(matrix_items, str):
@@ -127,7 +133,7 @@ def read_audit_data() -> Union[pd.DataFrame, str]:
                 'Referenced Clauses': findings_df['Referenced Clauses'].map(split_and_clean),
             }
         )
-        .groupby('Audit ID')
+        .groupby('Audit ID', sort=False)
         .agg({
             'Classification': list,
             'Referenced Clauses': lambda s: [item for sublist in s for item in sublist]
@@ -140,4 +146,6 @@ def read_audit_data() -> Union[pd.DataFrame, str]:
     for classification in map_dropdown_ids(['dd_ncFindingClass'])['dd_ncFindingClass']:
         df_audits[f'# {classification}'] = df_audits['Classification'].apply(lambda lst: lst.count(classification) if isinstance(lst, list) else 0)
     
+    write_df_cache('audits', df_audits)
+    write_df_cache('audit_findings', findings_df)
     return df_audits, findings_df
@@ -4,16 +4,20 @@ import numpy as np
 import pandas as pd
 import streamlit as st
 
-from read_data import add_period_cols, correct_date_dtype
+from read_data import add_period_cols, correct_date_dtype, read_df_cache, to_period_categorical, write_df_cache
 from read_data.matrix import get_matrix_items, map_dropdown_ids
-from utils.constants import DATE_COLS
+from utils.constants import DATE_COLS, INTERVALS
 
 
-@st.cache_data
+@st.cache_resource
 def read_capa_data() -> Union[pd.DataFrame, str]:
     """
     Reads CAPA data from Matrix, processes date and dropdown fields,
     and returns a cleaned DataFrame.
+    
+    The results are also cached on disk (in DF_CACHE_DIR, outside the app directory), and read
+    from there if recent enough and they have the columns the KPI columns are derived from.
+    Every rerun gets the same DataFrame object, so callers must not mutate it.
 
     Parameters:
         None
@@ -29,7 +33,33 @@ def read_capa_data() -> Union[pd.DataFrame, str]:
     def compute_age(row):
         end_date = pd.Timestamp.today().normalize() if row['Status'] == 'Open' else row['Date of Submission']
         return (end_date - row['Date Created']).days
+
+    # Columns that add_kpi_cols derives the KPI columns from
+    kpi_src_cols = (
+        list(DATE_COLS['CAPAs']) + ['Effectiveness Verification Status', 'Age'] +
+        [interval_ + ' of Submission' for interval_ in INTERVALS]
+    )
+
+    def add_kpi_cols(df):
+        # Per-CAPA outcomes that the commitment and effectiveness KPIs count
+        df['Submitted On Time'] = np.less_equal(df['Date of Submission'].to_numpy(), df['Due Date'].to_numpy())  # NaT -> False
+        df['Passed Effectiveness Verification'] = (df['Effectiveness Verification Status'] == 'Pass').to_numpy()
+        df['Submitted Within 90d'] = (df['Age'] <= 90).to_numpy()  # Only meaningful for closed CAPAs
+
+        # Submission periods as categoricals over all reporting periods, so that the codes index directly
+        # into ALL_PERIODS. Arrow can't store categoricals of periods, so this is done after writing the disk cache
+        for interval_ in INTERVALS:
+            col = interval_ + ' of Submission'
+            df[col] = to_period_categorical(df[col], interval_)
+
+        # Earliest date of any kind, which the CAPA page's period filter starts at
+        df.attrs['min_date'] = pd.Timestamp(df[list(DATE_COLS['CAPAs'])].min(axis=None))
+        return df
     
+    df_capas = read_df_cache('capas', columns=kpi_src_cols)
+    if df_capas is not None:
+        return add_kpi_cols(df_capas)
+
     matrix_items = get_matrix_items('CAPA')
     if isinstance(matrix_items, str):
         return matrix_items
@@ -38,6 +68,7 @@ def read_capa_data() -> Union[pd.DataFrame, str]:
 
     df_capas['Status'] = df_capas.apply(compute_status, axis=1)
     df_capas['Age'] = df_capas.apply(compute_age, axis=1)
+    df_capas['Status'] = df_capas['Status'].astype('category')  # Only 'Open' and 'Closed'
 
     dd_ids = {
         'dd_dispositions': 'Disposition',
@@ -56,10 +87,12 @@ def read_capa_data() -> Union[pd.DataFrame, str]:
             mapped_dd_ids['dd_CAPA_Product'][id].split(' ')[0]
         )
 
-    # Replace dropdown IDs in DataFrame with labels
+    # Replace dropdown IDs in DataFrame with labels. The labels are only grouped on and filtered by,
+    # so store them as categoricals
     for dd_id, col in dd_ids.items():
-        df_capas[col] = df_capas[col].map(mapped_dd_ids[dd_id])
+        df_capas[col] = df_capas[col].map(mapped_dd_ids[dd_id]).astype('category')
 
     add_period_cols(df_capas, DATE_COLS['CAPAs'])
 
-    return df_capas
+    write_df_cache('capas', df_capas)
+    return add_kpi_cols(df_capas)
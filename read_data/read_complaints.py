@@ -3,17 +3,19 @@ from typing import Union
 import pandas as pd
 import streamlit as st
 
-from utils.constants import DATE_COLS
+from utils.constants import BREAKDOWN_COLS, DATE_COLS
 from read_data import add_period_cols, correct_date_dtype
 from read_data.salesforce import get_sf_records, sf
 
 
-@st.cache_data
+@st.cache_resource
 def read_complaint_data() -> Union[pd.DataFrame, str]:
     """
     Reads complaint data from Salesforce, processes dates and fields,
     and returns a cleaned DataFrame.
 
+    Every rerun gets the same DataFrame object, so callers must not mutate it.
+
     Parameters:
         None
 
@@ -33,6 +35,9 @@ def read_complaint_data() -> Union[pd.DataFrame, str]:
     # Default missing values
     df_complaints['Is Safety Issue'] = df_complaints['Is Safety Issue'].fillna('No')
 
+    # Breakdown columns are only grouped on and filtered by, so store them as categoricals
+    df_complaints[BREAKDOWN_COLS['Complaints']] = df_complaints[BREAKDOWN_COLS['Complaints']].astype('category')
+
     # Derived time durations
     df_complaints['# Days to Open'] = (
         df_complaints['Complaint Created Date'] - df_complaints['Complaint Received Date']
@@ -40,7 +45,11 @@ def read_complaint_data() -> Union[pd.DataFrame, str]:
     df_complaints['# Days Open'] = (
         df_complaints['Completed Date'] - df_complaints['Complaint Created Date']
     ).dt.days
+    df_complaints['Closed Within 60d'] = (df_complaints['# Days Open'] <= 60).to_numpy()  # What complaint commitment counts
+
+    add_period_cols(df_complaints, DATE_COLS['Complaints'], categorical=True)
 
-    add_period_cols(df_complaints, DATE_COLS['Complaints'])
+    # Earliest date of any kind, which the complaint page's period filter starts at
+    df_complaints.attrs['min_date'] = pd.Timestamp(df_complaints[list(DATE_COLS['Complaints'])].min(axis=None))
 
     return df_complaints
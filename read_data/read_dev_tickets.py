@@ -5,6 +5,7 @@ import pandas as pd
 import streamlit as st
 
 from read_data import add_period_cols, correct_date_dtype
+from utils.constants import DATE_COLS
 
 
 @st.cache_data
@@ -93,5 +94,8 @@ def read_dev_ticket_data() -> pd.DataFrame:
     issue_df = correct_date_dtype(pd.DataFrame.from_records(issue_dicts, index='ID'))
     add_period_cols(issue_df)
     issue_df['Completion Time'] = issue_df['Done Date'] - issue_df['Start Date']
+
+    # Earliest date of any kind, which the ticket page's period filter starts at
+    issue_df.attrs['min_date'] = pd.Timestamp(issue_df[list(DATE_COLS['Development Tickets'])].min(axis=None))
     
     return issue_df
@@ -29,8 +29,10 @@ def read_training_data() -> Union[pd.DataFrame, str]:
     if isinstance(df_training, str):
         return df_training
 
-    # Clean numeric values (remove parentheses and cast to int)
-    df_training.iloc[:, 2:] = df_training.iloc[:, 2:].map(lambda x: x.split(' (')[0]).astype(int)
+    # Clean numeric values (remove parentheses and cast to int). Assigned by column label so that the columns take
+    # the new dtype (assigning through `iloc` keeps the sheet's object dtype). Counts fit in 32 bits
+    ct_cols = df_training.columns[2:]
+    df_training[ct_cols] = df_training[ct_cols].map(lambda x: x.split(' (')[0]).astype(np.int32)
 
     # Add computed columns
     df_training['# Open Trainings Overdue'] = (
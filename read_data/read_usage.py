@@ -6,13 +6,15 @@ import streamlit as st
 from read_data import add_period_cols, correct_date_dtype
 from read_data.mixpanel import read_mp_usage
 from read_data.salesforce import get_sf_records, sf
+from utils.constants import BREAKDOWN_COLS
 
 
-@st.cache_data
+@st.cache_resource
 def read_usage_data() -> Union[pd.DataFrame, str]:
     """
     Reads product usage data from Salesforce and enriches it with account and device information.
     Excludes accounts whose names contain "test" or "radformation" (case-insensitive).
+    Every rerun gets the same DataFrame object, so callers must not mutate it.
 
     Returns:
         Union[pd.DataFrame, str]:
@@ -61,7 +63,13 @@ def read_usage_data() -> Union[pd.DataFrame, str]:
     # Retrieve LC data
     mp_usage = read_mp_usage()
     df_usage = pd.concat([df_usage, mp_usage])
+    df_usage['Account'] = df_usage['Account'].astype('category')  # Only counted per period, so store as codes
+    # Breakdown columns have few distinct values, so filtering on them compares small integer codes
+    df_usage[BREAKDOWN_COLS['Usage']] = df_usage[BREAKDOWN_COLS['Usage']].astype('category')
 
     add_period_cols(df_usage)
 
+    # Earliest usage date, which the usage page's period filter starts at
+    df_usage.attrs['min_date'] = df_usage['Usage Date'].min()
+
     return df_usage
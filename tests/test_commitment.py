@@ -0,0 +1,93 @@
+import importlib.util
+import os
+import sys
+import types
+
+import pandas as pd
+import pytest
+
+st = pytest.importorskip('streamlit')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGE_MODULES = {
+    'Audits': ('pages.Audits', 'compute_audit_commitment', 'df_audits'),
+    'CAPAs': ('pages.CAPAs', 'compute_capa_commitment', 'df_capas'),
+    'Complaints': ('pages.Complaints', 'compute_complaint_commitment', 'df_complaints'),
+    'Training': ('pages.Training', 'compute_training_commitment', 'df_training_mo'),
+}
+
+
+def monthly(values, start):
+    """Returns `values` as a Series indexed by consecutive months from `start`."""
+    return pd.Series(values, index=pd.period_range(start=start, periods=len(values), freq='M'), dtype=float)
+
+
+@pytest.fixture
+def main_page(monkeypatch):
+    """
+    Imports the main page with its external dependencies (secrets, Salesforce) stubbed out.
+
+    Returns a function that stubs the page modules with the given commitments and source data, and returns the
+    main page's `compute_commitment`.
+    """
+    monkeypatch.syspath_prepend(ROOT)
+    monkeypatch.setattr(st, 'secrets', {'matrix': {'token': ''}})
+    salesforce = types.ModuleType('read_data.salesforce')
+    salesforce.read_release_dates = lambda: pd.DataFrame()
+    monkeypatch.setitem(sys.modules, 'read_data.salesforce', salesforce)
+
+    spec = importlib.util.spec_from_file_location('ra_qa_kpis', os.path.join(ROOT, 'RA_QA KPIs.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    def stub_pages(commitments, src_data=None):
+        src_data = src_data or {}
+        for category, (module_name, func_name, df_name) in PAGE_MODULES.items():
+            page = types.ModuleType(module_name)
+            commitment = commitments[category]
+            if category == 'Training':  # Training commitment is computed for every interval at once
+                setattr(page, func_name, lambda commitment=commitment: {'Month': commitment})
+            else:
+                setattr(page, func_name, lambda *args, commitment=commitment: commitment)
+            setattr(page, df_name, src_data.get(category, pd.DataFrame()))
+            monkeypatch.setitem(sys.modules, module_name, page)
+        module.compute_commitment.clear()
+        return module.compute_commitment
+
+    return stub_pages
+
+
+def test_commitment_is_in_chronological_order(main_page):
+    # Audits have planned (future) periods and start latest, so they would lead an unsorted outer join
+    compute_commitment = main_page({
+        'Audits': monthly([100, 50, 0], '2024-06'),
+        'CAPAs': monthly([100] * 6, '2024-01'),
+        'Complaints': monthly([50] * 4, '2024-02'),
+        'Training': monthly([0] * 5, '2024-03'),
+    })
+
+    commitment, min_period, min_period_category = compute_commitment('Month')
+
+    assert commitment.index.is_monotonic_increasing
+    assert list(commitment.index) == list(pd.period_range('2024-01', '2024-08', freq='M'))
+    assert (min_period, min_period_category) == (pd.Period('2024-06', 'M'), 'Audits')
+
+
+def test_commitment_names_every_source_not_retrieved(main_page):
+    compute_commitment = main_page(
+        {category: None for category in PAGE_MODULES},
+        src_data={'CAPAs': 'Could not read CAPAs.', 'Training': 'Could not read training.'}
+    )
+
+    assert compute_commitment('Month') == 'Cannot compute commitment because CAPAs and Training data could not be retrieved.'
+
+
+def test_commitment_names_commitments_not_computed(main_page):
+    compute_commitment = main_page({
+        'Audits': monthly([100], '2024-01'),
+        'CAPAs': None,
+        'Complaints': monthly([100], '2024-01'),
+        'Training': None,
+    })
+
+    assert compute_commitment('Month') == 'Cannot compute commitment because CAPAs and Training commitment could not be computed.'
@@ -35,7 +35,11 @@ def compute_bin_width(data_list: List[Iterable[Union[int, float]]]) -> float:
     return max(bin_width, 1)  # ensure at least 1
 
 
-def compute_cts(src: str, filtered_df: pd.DataFrame) -> Dict[str, Tuple[pd.Series, pd.DataFrame]]:
+def compute_cts(
+    src: str,
+    filtered_df: pd.DataFrame,
+    date_cols: Optional[List[str]] = None
+) -> Dict[str, Tuple[pd.Series, pd.DataFrame]]:
     """
     Computes counts of records for a given time interval, both total and broken down by a category.
 
@@ -46,6 +50,8 @@ def compute_cts(src: str, filtered_df: pd.DataFrame) -> Dict[str, Tuple[pd.Serie
     Parameters:
         src (str): Key identifying the source dataset in DATE_COLS.
         filtered_df (pd.DataFrame): DataFrame containing the filtered records to count.
+        date_cols (Optional[List[str]]): Date columns to compute counts for. Defaults to None.
+                                         If None, uses all date columns in DATE_COLS[src].
 
     Returns:
         Dict[str, Tuple[pd.Series, pd.DataFrame]]:
@@ -69,31 +75,114 @@ def compute_cts(src: str, filtered_df: pd.DataFrame) -> Dict[str, Tuple[pd.Serie
         2024-02        4         1
         2024-03        3         0
     """
-    cts: Dict[str, Tuple[pd.Series, pd.DataFrame]] = {}
     page = get_settings().get_page(src)
     interval, breakdown_category = page.interval, page.breakdown
+    date_cols = list(DATE_COLS[src] if date_cols is None else date_cols)
+
+    # Only the columns that are counted are passed, so the cache key is a hash of those rather than of every field
+    cols = [col.replace('Date', interval) for col in date_cols]  # E.g., "Date Created" -> "Month Created"
+    if breakdown_category is not None:
+        cols.append(breakdown_category)
+    return compute_cts_from_df(filtered_df[cols], date_cols, interval, breakdown_category)
+
+
+@st.cache_data(max_entries=100)
+def compute_cts_from_df(
+    df: pd.DataFrame,
+    date_cols: List[str],
+    interval: str = 'Month',
+    breakdown_category: Optional[str] = None
+) -> Dict[str, Tuple[pd.Series, pd.DataFrame]]:
+    """
+    Computes the counts returned by `compute_cts`. Cached on the contents of `df`, so reruns that don't change the
+    filtered records (e.g., toggling the trendline) reuse the counts. Counts are shared by all sessions; the least
+    recently used are evicted beyond `max_entries`.
+
+    Parameters:
+        df (pd.DataFrame): Records to count. Must have the period column for each date column in `date_cols`, and
+                           the `breakdown_category` column if given.
+        date_cols (List[str]): Date columns to compute counts for.
+        interval (str): Time interval to count by ('Month', 'Quarter', 'Year'). Defaults to 'Month'.
+        breakdown_category (Optional[str]): Column to break the counts down by. Defaults to None (no breakdown).
 
-    for col in DATE_COLS[src]:
-        period_col = col.replace('Date', interval)  # E.g., "Date Created" -> "Month Created"
+    Returns:
+        Dict[str, Tuple[pd.Series, pd.DataFrame]]: Counts, as returned by `compute_cts`.
+    """
+    cts: Dict[str, Tuple[pd.Series, pd.DataFrame]] = {}
+    periods = ALL_PERIODS[interval]  # Every count is indexed by these
+    n_periods = len(periods)
+
+    if breakdown_category is not None:
+        # Codes of the breakdown category values, in sorted (or, if categorical, category) order. Missing values
+        # have code -1
+        cat_codes, cat_vals = pd.factorize(df[breakdown_category], sort=True)
+        n_cats = len(cat_vals)
+
+    for col in date_cols:
+        period_col = col.replace('Date', interval)
+
+        # Position of each record's period in ALL_PERIODS, or -1 if missing or not a reporting period. Period
+        # columns stored as categoricals over ALL_PERIODS already have these as their codes
+        period_vals = df[period_col]
+        if isinstance(period_vals.dtype, pd.CategoricalDtype):
+            period_codes = period_vals.cat.codes.to_numpy().astype(np.intp)  # Wide enough to combine with category codes
+        else:
+            period_codes = periods.get_indexer(period_vals)
+        has_period = period_codes >= 0
 
-        # Total counts per period
-        total_cts = filtered_df.groupby(period_col).size().reindex(ALL_PERIODS[interval], fill_value=0)
+        # Total counts per period. Unnamed like a groupby size, so it isn't labeled "count" in plot legends
+        total_cts = pd.Series(np.bincount(period_codes[has_period], minlength=n_periods), index=periods)
 
         if breakdown_category is None:
             cts[col] = (total_cts, total_cts)
         else:
-            # Counts broken down by category
-            cts_by_selection = (
-                filtered_df.groupby([period_col, breakdown_category])
-                .size()
-                .unstack(fill_value=0)
-                .reindex(ALL_PERIODS[interval], fill_value=0)
+            # Counts broken down by category: one bincount over (period, category) pairs, with a column per category
+            # that has any records in the reporting periods
+            in_both = has_period & (cat_codes >= 0)
+            cts_by_cat = np.bincount(
+                period_codes[in_both] * n_cats + cat_codes[in_both], minlength=n_periods * n_cats
+            ).reshape(n_periods, n_cats)
+            observed = cts_by_cat.any(axis=0)
+            cts_by_selection = pd.DataFrame(
+                cts_by_cat[:, observed], index=periods, columns=cat_vals[observed].rename(breakdown_category)
             )
             cts[col] = (total_cts, cts_by_selection)
 
     return cts
 
 
+def compute_pct(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """
+    Computes `numerator` as a percentage of `denominator`, elementwise.
+
+    Where the denominator is zero, the percentage is NaN (i.e., "no data") rather than infinite.
+    Divides the underlying arrays directly instead of first replacing zeros in a copy of the
+    denominator.
+
+    Parameters:
+        numerator (pd.Series): Numerator values. Must be aligned with (have the same index as) `denominator`.
+        denominator (pd.Series): Denominator values.
+
+    Returns:
+        pd.Series: Percentages, indexed like `denominator`.
+
+    Example:
+        >>> compute_pct(pd.Series([1, 0, 3]), pd.Series([2, 0, 4]))
+        0    50.0
+        1     NaN
+        2    75.0
+        dtype: float64
+    """
+    denominator_ = denominator.to_numpy(dtype=float)
+    pct = np.divide(
+        numerator.to_numpy(dtype=float),
+        denominator_,
+        out=np.full(len(denominator_), np.nan),
+        where=denominator_ != 0
+    ) * 100
+    return pd.Series(pct, index=denominator.index)
+
+
 def compute_trendline(
     y_values: Sequence[float],
     pred_before: int = 0,
@@ -174,6 +263,35 @@ def create_shifted_cmap(cmap_name: str, shift: Optional[int] = None) -> ListedCo
     return ListedColormap(shifted_colors)
 
 
+@st.cache_resource
+def get_period_range(
+    interval: str,
+    start: Optional[pd.Period] = None,
+    end: Optional[pd.Period] = None
+) -> pd.PeriodIndex:
+    """
+    Returns the periods of the given interval from `start` through `end`.
+
+    Each range is built once per process and the same (immutable) index is returned on every rerun, so reindexing
+    onto it doesn't rebuild the target index. If the range is all of ALL_PERIODS[interval], that index is returned,
+    which period counts are already aligned with.
+
+    Parameters:
+        interval (str): Time interval of the periods ('Month', 'Quarter', 'Year').
+        start (Optional[pd.Period]): First period. If not provided, uses the first period in ALL_PERIODS.
+        end (Optional[pd.Period]): Last period. If not provided, uses the last period in ALL_PERIODS.
+
+    Returns:
+        pd.PeriodIndex: Periods from `start` through `end`.
+    """
+    all_periods = ALL_PERIODS[interval]
+    start = all_periods[0] if start is None else start
+    end = all_periods[-1] if end is None else end
+    if start == all_periods[0] and end == all_periods[-1]:
+        return all_periods
+    return pd.period_range(start=start, end=end, freq=interval[0])
+
+
 def init_page(pg_title: str) -> None:
     """
     Safely initializes the Streamlit page configuration.
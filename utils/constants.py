@@ -163,7 +163,7 @@ def compute_all_periods():
     for interval_ in INTERVALS:
         all_periods[interval_] = pd.period_range(start=RAD_DATE, end=end, freq=interval_[0])
     return all_periods
-ALL_PERIODS = compute_all_periods()
+ALL_PERIODS = compute_all_periods()  # Built once per process and shared as the reindex target for every period count
 
 # Matrix
 
@@ -1,5 +1,6 @@
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -199,6 +200,37 @@ def render_period_filter(
     return page.get_period(interval)
 
 
+@st.cache_data
+def get_breakdown_options(page_name: str, _df: pd.DataFrame) -> Dict[str, List[str]]:
+    """
+    Returns the sorted unique values in each of the page's breakdown columns. For list columns, the unique
+    individual list elements, not the lists themselves, are returned. Assumes all values in a column are strings
+    or all values are lists of strings.
+
+    Cached on `page_name` only (Streamlit doesn't hash arguments whose names start with an underscore), as each
+    page passes its full data, which is read once per process. This saves scanning and sorting every column on
+    every rerun.
+
+    Parameters:
+        page_name (str): The page whose breakdown columns to get the values of. Should be a key in
+                         constants.BREAKDOWN_COLS.
+        _df (pd.DataFrame): The page's full (unfiltered) data.
+
+    Returns:
+        Dict[str, List[str]]: Dictionary of column name -> sorted unique values
+    """
+    def get_unique(col: str) -> List[str]:
+        if len(_df) == 0:  # Empty DataFrame -> no values
+            return []
+        first_val = _df[col].iloc[0]
+        if isinstance(first_val, list):
+            return sorted({item for lst in _df[col] for item in lst}, key=get_options_sorting_key(col))
+        else:
+            return sorted(_df[col].unique(), key=get_options_sorting_key(col))
+
+    return {col: get_unique(col) for col in BREAKDOWN_COLS[page_name]}
+
+
 def render_breakdown_fixed(page_name: str, df: pd.DataFrame) -> pd.DataFrame:
     """
     Renders breakdown selectbox and fixed-category multiselect filters for a page,
@@ -215,29 +247,11 @@ def render_breakdown_fixed(page_name: str, df: pd.DataFrame) -> pd.DataFrame:
     settings = get_settings()
     page = settings.get_page(page_name)
 
-    def get_unique(col: str) -> list[str]:
-        """
-        Returns unique values in a string or list column. If a list column, the unique individual
-        list elements, not the lists themselves, are returned. Assumes all values are strings or all
-        values are lists of strings.
-        
-        Parameters:
-            col (str): The DataFrame column whose unique values to return
-            
-        Returns:
-            list[str]: List of unique values in the DataFrame column
-        """
-        if len(df) == 0:  # Empty DataFrame -> no values
-            return []
-        first_val = df[col].iloc[0]
-        if isinstance(first_val, list):
-            return sorted({item for lst in df[col] for item in lst}, key=get_options_sorting_key(col))
-        else:
-            return sorted(df[col].unique(), key=get_options_sorting_key(col))
+    unique_vals = get_breakdown_options(page_name, df)
 
     # Breakdown categories
     breakdown_cat_options = [
-        c for c in BREAKDOWN_COLS[page_name] if len(get_unique(c)) <= 5
+        c for c in BREAKDOWN_COLS[page_name] if len(unique_vals[c]) <= 5
     ]  # Restrict to columns w/ at most 5 unique values
     breakdown_cat_options.sort()
     breakdown_key = f'{page_name}_breakdown'
@@ -261,7 +275,7 @@ def render_breakdown_fixed(page_name: str, df: pd.DataFrame) -> pd.DataFrame:
     fixed_categories = [c for c in BREAKDOWN_COLS[page_name] if c != page.breakdown]
     with st.expander('Filters', expanded=True):
         for cat in fixed_categories:
-            options = get_unique(cat)
+            options = unique_vals[cat]
             filter_key = f'{page_name}_{cat}_filter'
             # Initialize only if missing
             if filter_key not in st.session_state:
@@ -276,13 +290,21 @@ def render_breakdown_fixed(page_name: str, df: pd.DataFrame) -> pd.DataFrame:
 
             page.filters[cat] = st.session_state[filter_key]
 
-    # Apply mask
-    mask = pd.Series(True, index=df.index)
-    for cat in fixed_categories:
-        sample_val = df[cat].iloc[0]
-        if isinstance(sample_val, list):
-            mask &= df[cat].apply(lambda x: any(item in page.filters[cat] for item in x))
-        else:
-            mask &= df[cat].isin(page.filters[cat])
+    # Apply all filters as a single boolean mask over the underlying arrays (no index alignment per filter)
+    mask = np.ones(len(df), dtype=bool)
+    if len(df) > 0:
+        for cat in fixed_categories:
+            if isinstance(df[cat].iloc[0], list):
+                selected = set(page.filters[cat])
+                mask &= df[cat].map(lambda x: not selected.isdisjoint(x)).to_numpy(dtype=bool)
+            elif isinstance(df[cat].dtype, pd.CategoricalDtype):
+                # Lookup table of selected category codes. The extra last entry is indexed by code -1 (missing value)
+                is_selected = np.zeros(len(df[cat].cat.categories) + 1, dtype=bool)
+                selected_codes = df[cat].cat.categories.get_indexer(page.filters[cat])
+                is_selected[selected_codes[selected_codes >= 0]] = True
+                is_selected[-1] = any(pd.isna(val) for val in page.filters[cat])
+                mask &= is_selected[df[cat].cat.codes.to_numpy()]
+            else:
+                mask &= df[cat].isin(page.filters[cat]).to_numpy()
 
     return df.loc[mask]
@@ -11,7 +11,7 @@ import streamlit.components.v1 as components
 import textwrap
 
 from read_data.salesforce import read_release_dates
-from utils import compute_trendline
+from utils import compute_trendline, get_period_range
 from utils.constants import ALL_PERIODS, PROD_ABBRVS, PROD_COLORS, RAD_COLOR
 from utils.settings import get_settings
 from utils.text_fmt import items_in_a_series, period_str
@@ -142,8 +142,7 @@ def plot_bar(
 
     min_period = kwargs.get('min_period', ALL_PERIODS[interval][0])
     max_period = kwargs.get('max_period', ALL_PERIODS[interval][-1])
-    all_periods_all = pd.period_range(start=min_period, end=max_period, freq=interval[0])
-    data = data.reindex(all_periods_all)
+    data = data.reindex(get_period_range(interval, min_period, max_period))
     
     # Replace missing values with zero
     if kwargs.get('missing_as_zero', False):
@@ -166,7 +165,7 @@ def plot_bar(
         return fig, ax
 
     msgs = kwargs.get('msgs', [])
-    all_periods = pd.period_range(start=start, end=end, freq=interval[0])
+    all_periods = get_period_range(interval, start, end)
     x_labels = [period_str(period, interval) for period in all_periods]
     
     y_lim = -float('inf')
@@ -175,9 +174,9 @@ def plot_bar(
     if grouped_data is None:
         bar_data = data
     else:
-        grouped_data = grouped_data.reindex(ALL_PERIODS[interval], fill_value=0)
+        grouped_data = grouped_data.reindex(get_period_range(interval), fill_value=0)
         bar_data = grouped_data
-    filtered_bar_data = bar_data[start:end].copy().fillna(0)
+    filtered_bar_data = bar_data[start:end].fillna(0)  # fillna already returns a new object
     if show_data:
         filtered_bar_data.plot(kind='bar', ax=ax, alpha=0.7, **kwargs.get('bar_kwargs', {'stacked': True}))
         y_lim = max(y_lim, filtered_bar_data.max() if isinstance(filtered_bar_data, pd.Series) else filtered_bar_data.sum(axis=1).max())
@@ -186,7 +185,7 @@ def plot_bar(
         
     # Linear trendline
     if show_trendline:
-        y_values = filtered_data.copy()
+        y_values = filtered_data  # Only sliced below, never modified
         pred_before = pred_after = 0
         trendline_msgs = []
         if 'min_period_msg' in kwargs and start == min_period:
@@ -238,7 +237,7 @@ def plot_bar(
     # Release dates
     if show_release_dates:
         release_data = read_release_dates()
-        filtered_release_data = release_data.copy()
+        filtered_release_data = release_data  # read_release_dates returns a fresh copy per call
         try:
             devices = next(val for key, val in page.filters.items() if 'device' in key.lower())
             filtered_release_data = filtered_release_data[filtered_release_data['Product'].isin(devices)]
@@ -337,7 +336,7 @@ def responsive_columns(
 
     - If the browser width is wider than `threshold`, creates `ncols` columns; otherwise a single column.
     - If `items` is provided, they are automatically distributed across the columns:
-        - matplotlib Figure objects are rendered with `st.pyplot`.
+        - matplotlib Figure objects are rendered with `st.pyplot`, then closed.
         - Callable objects are invoked inside the column.
         - Other values are passed to `st.write`.
         - None values are ignored.
@@ -367,6 +366,8 @@ def responsive_columns(
         with col:
             if isinstance(item, plt.Figure):
                 st.pyplot(item, bbox_inches='tight')
+                # Otherwise pyplot keeps every figure from every rerun open
+                plt.close(item)
             elif callable(item):
                 item()
             else:
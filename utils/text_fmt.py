@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import List, Optional, Union
 
 import pandas as pd
 
@@ -58,3 +58,34 @@ def period_str(period: Union[pd.Timestamp, pd.Period], interval: str = 'Month')
         return f'Q{quarter} {period.year}'
     else:  # Year
         return str(period.year)
+
+
+def period_range_str(
+    start: Union[pd.Timestamp, pd.Period],
+    end: Union[pd.Timestamp, pd.Period],
+    interval: str = 'Month',
+    preposition: Optional[str] = 'during'
+) -> str:
+    """
+    Formats a range of periods as a human-readable phrase, for use in messages about the selected time range.
+
+    Parameters:
+        start (Union[pd.Timestamp, pd.Period]): First period in the range.
+        end (Union[pd.Timestamp, pd.Period]): Last period in the range.
+        interval (Optional[str]): Time interval type. Must be one of 'Month', 'Quarter', or 'Year'. Defaults to 'Month'.
+        preposition (Optional[str]): Word to put before a single period. Defaults to "during". If None, a single period
+                                     is returned on its own.
+
+    Returns:
+        str: Formatted string representing the range.
+
+    Examples:
+        >>> period_range_str(pd.Period('2025-01', 'M'), pd.Period('2025-01', 'M'))
+        'during Jan 2025'
+
+        >>> period_range_str(pd.Period('2025Q1', 'Q'), pd.Period('2025Q3', 'Q'), 'Quarter')
+        'between Q1 2025 and Q3 2025'
+    """
+    if start == end:
+        return period_str(start, interval) if preposition is None else f'{preposition} {period_str(start, interval)}'
+    return f'between {period_str(start, interval)} and {period_str(end, interval)}'